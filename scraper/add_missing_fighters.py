@@ -1,8 +1,5 @@
-import requests
-from bs4 import BeautifulSoup
-import json
-import re
-import time
+from extractor import fetch_fighter
+from fighter_store import KEEP_RICHER, MemoryFighterStore
 
 def search_fighter_on_ufcstats(fighter_name):
     """Search for a fighter on UFC Stats and return their URL"""
@@ -20,150 +17,7 @@ def search_fighter_on_ufcstats(fighter_name):
 
 def scrape_fighter(url):
     """Scrape a specific fighter's details"""
-    headers = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'}
-    response = requests.get(url, headers=headers)
-    soup = BeautifulSoup(response.content, 'html.parser')
-    
-    stats = {}
-    
-    # Get name
-    name_tag = soup.find('span', class_='b-content__title-highlight')
-    if name_tag:
-        stats['name'] = name_tag.text.strip()
-    
-    # Nickname
-    nickname_tag = soup.find('p', class_='b-content__Nickname')
-    if nickname_tag:
-        nickname_text = nickname_tag.text.strip()
-        if 'Nickname:' in nickname_text:
-            stats['nickname'] = nickname_text.replace('Nickname:', '').strip()
-        else:
-            stats['nickname'] = ""
-    else:
-        stats['nickname'] = ""
-    
-    # Set default values
-    stats['height'] = "--"
-    stats['weight'] = "--"
-    stats['reach'] = "--"
-    stats['stance'] = ""
-    stats['dob'] = "--"
-    stats['wins'] = 0
-    stats['losses'] = 0
-    stats['draws'] = 0
-    stats['sig_strikes_landed_per_min'] = "0.00"
-    stats['striking_accuracy'] = "0%"
-    stats['sig_strikes_absorbed_per_min'] = "0.00"
-    stats['striking_defense'] = "0%"
-    stats['takedown_avg'] = "0.00"
-    stats['takedown_accuracy'] = "0%"
-    stats['takedown_defense'] = "0%"
-    stats['submission_avg'] = "0.0"
-    
-    # Fighter details
-    details_list = soup.find_all('li', class_='b-list__box-list-item')
-    for item in details_list:
-        label = item.text.strip()
-        if 'Height:' in label:
-            stats['height'] = label.split('Height:')[1].strip()
-        elif 'Weight:' in label:
-            stats['weight'] = label.split('Weight:')[1].strip()
-        elif 'Reach:' in label:
-            stats['reach'] = label.split('Reach:')[1].strip()
-        elif 'STANCE:' in label:
-            stats['stance'] = label.split('STANCE:')[1].strip()
-    
-    # Record
-    record_tag = soup.find('span', class_='b-content__title-record')
-    if record_tag:
-        record_text = record_tag.text.strip()
-        record_match = re.search(r'Record:\s*(\d+)-(\d+)-(\d+)', record_text)
-        if record_match:
-            stats['wins'] = int(record_match.group(1))
-            stats['losses'] = int(record_match.group(2))
-            stats['draws'] = int(record_match.group(3))
-    
-    # Career stats
-    career_stats = soup.find_all('div', class_='b-list__info-box-left')
-    for stat_box in career_stats:
-        items = stat_box.find_all('li', class_='b-list__box-list-item')
-        for item in items:
-            text = item.text.strip()
-            if 'SLpM:' in text:
-                stats['sig_strikes_landed_per_min'] = text.split('SLpM:')[1].strip()
-            elif 'Str. Acc.:' in text:
-                stats['striking_accuracy'] = text.split('Str. Acc.:')[1].strip()
-            elif 'SApM:' in text:
-                stats['sig_strikes_absorbed_per_min'] = text.split('SApM:')[1].strip()
-            elif 'Str. Def:' in text:
-                stats['striking_defense'] = text.split('Str. Def:')[1].strip()
-            elif 'TD Avg.:' in text:
-                stats['takedown_avg'] = text.split('TD Avg.:')[1].strip()
-            elif 'TD Acc.:' in text:
-                stats['takedown_accuracy'] = text.split('TD Acc.:')[1].strip()
-            elif 'TD Def.:' in text:
-                stats['takedown_defense'] = text.split('TD Def.:')[1].strip()
-            elif 'Sub. Avg.:' in text:
-                stats['submission_avg'] = text.split('Sub. Avg.:')[1].strip()
-    
-    # Fight history - last 3 fights
-    stats['last_3_fights'] = scrape_fight_history(soup)
-    
-    return stats
-
-def scrape_fight_history(soup):
-    """Extract last 3 fights from fighter page"""
-    fights = []
-    
-    try:
-        # Find the fight history table
-        fight_table = soup.find('table', class_='b-fight-details__table')
-        
-        if fight_table:
-            rows = fight_table.find_all('tr', class_='b-fight-details__table-row')[1:]  # Skip header
-            
-            # Get last 3 fights (or fewer if they don't have 3)
-            for row in rows[:3]:
-                cols = row.find_all('td')
-                
-                if len(cols) >= 2:
-                    fight_data = {}
-                    
-                    # Result (W/L/D/NC)
-                    result_col = cols[0]
-                    result_text = result_col.text.strip()
-                    if result_text:
-                        fight_data['result'] = result_text
-                    
-                    # Opponent name
-                    opponent_col = cols[1]
-                    opponent_link = opponent_col.find('a')
-                    if opponent_link:
-                        fight_data['opponent'] = opponent_link.text.strip()
-                    
-                    # Method (KO/TKO, SUB, DEC, etc)
-                    if len(cols) >= 7:
-                        method_col = cols[6]
-                        method_text = method_col.text.strip()
-                        # Parse method and round
-                        method_parts = method_text.split()
-                        if method_parts:
-                            fight_data['method'] = method_parts[0]
-                        
-                        # Round
-                        if len(cols) >= 8:
-                            round_col = cols[7]
-                            round_text = round_col.text.strip()
-                            if round_text:
-                                fight_data['round'] = round_text
-                    
-                    if fight_data:
-                        fights.append(fight_data)
-    
-    except Exception as e:
-        print(f"Error scraping fight history: {e}")
-    
-    return fights
+    return fetch_fighter(url).to_dict()
 
 def add_fighter_manually(name, nickname="", height="--", weight="--", reach="--", 
                          stance="", wins=0, losses=0, draws=0):
@@ -219,35 +73,20 @@ def main():
         {"name": "David Onama", "nickname": "The Silent Assassin", "weight": "145 lbs."}
     ]
     
-    # Load existing data
-    try:
-        with open('../public/fighters_data.json', 'r', encoding='utf-8') as f:
-            existing = json.load(f)
-    except FileNotFoundError:
-        existing = []
+    # Placeholders never overwrite a record that already has more real data
+    store = MemoryFighterStore.load(policy=KEEP_RICHER)
     
-    existing_names = {f['name'] for f in existing if 'name' in f}
-    
-    # Add missing fighters
     for fighter_data in missing_fighters:
-        if fighter_data['name'] in existing_names:
+        outcome = store.upsert(add_fighter_manually(**fighter_data))
+        if outcome == 'kept':
             print(f"✓ {fighter_data['name']} already in database")
-            continue
-        
-        print(f"Adding {fighter_data['name']} manually...")
-        fighter_stats = add_fighter_manually(**fighter_data)
-        existing.append(fighter_stats)
-        print(f"✓ Added {fighter_data['name']}")
+        else:
+            print(f"✓ {outcome.capitalize()} {fighter_data['name']}")
         
-    # Save updated data
-    with open('../public/fighters_data.json', 'w', encoding='utf-8') as f:
-        json.dump(existing, indent=2, fp=f, ensure_ascii=False)
-    
-    # Copy to dist folder
-    with open('../dist/fighters_data.json', 'w', encoding='utf-8') as f:
-        json.dump(existing, indent=2, fp=f, ensure_ascii=False)
+    # Serialize once and atomically replace public/ and dist/ copies
+    store.save()
     
-    print(f"\n✅ Done! Total fighters: {len(existing)}")
+    print(f"\n✅ Done! Total fighters: {len(store)}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
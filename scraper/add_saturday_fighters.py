@@ -1,73 +1,10 @@
-import requests
-from bs4 import BeautifulSoup
-import json
-import re
+from extractor import fetch_fighter
+from fetcher import get_fetcher
+from fighter_store import KEEP_NEWER, MemoryFighterStore
 
 def scrape_fighter(url):
     """Scrape a specific fighter's details"""
-    headers = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'}
-    response = requests.get(url, headers=headers)
-    soup = BeautifulSoup(response.content, 'html.parser')
-    
-    stats = {}
-    
-    # Get name
-    name_tag = soup.find('span', class_='b-content__title-highlight')
-    if name_tag:
-        stats['name'] = name_tag.text.strip()
-    
-    # Nickname
-    nickname_tag = soup.find('p', class_='b-content__Nickname')
-    if nickname_tag:
-        stats['nickname'] = nickname_tag.text.strip().replace('Nickname:', '').strip()
-    
-    # Fighter details
-    details_list = soup.find_all('li', class_='b-list__box-list-item')
-    for item in details_list:
-        label = item.text.strip()
-        if 'Height:' in label:
-            stats['height'] = label.split('Height:')[1].strip()
-        elif 'Weight:' in label:
-            stats['weight'] = label.split('Weight:')[1].strip()
-        elif 'Reach:' in label:
-            stats['reach'] = label.split('Reach:')[1].strip()
-        elif 'STANCE:' in label:
-            stats['stance'] = label.split('STANCE:')[1].strip()
-    
-    # Record
-    record_tag = soup.find('span', class_='b-content__title-record')
-    if record_tag:
-        record_text = record_tag.text.strip()
-        record_match = re.search(r'Record:\s*(\d+)-(\d+)-(\d+)', record_text)
-        if record_match:
-            stats['wins'] = int(record_match.group(1))
-            stats['losses'] = int(record_match.group(2))
-            stats['draws'] = int(record_match.group(3))
-    
-    # Career stats
-    career_stats = soup.find_all('div', class_='b-list__info-box-left')
-    for stat_box in career_stats:
-        items = stat_box.find_all('li', class_='b-list__box-list-item')
-        for item in items:
-            text = item.text.strip()
-            if 'SLpM:' in text:
-                stats['sig_strikes_landed_per_min'] = text.split('SLpM:')[1].strip()
-            elif 'Str. Acc.:' in text:
-                stats['striking_accuracy'] = text.split('Str. Acc.:')[1].strip()
-            elif 'SApM:' in text:
-                stats['sig_strikes_absorbed_per_min'] = text.split('SApM:')[1].strip()
-            elif 'Str. Def:' in text:
-                stats['striking_defense'] = text.split('Str. Def:')[1].strip()
-            elif 'TD Avg.:' in text:
-                stats['takedown_avg'] = text.split('TD Avg.:')[1].strip()
-            elif 'TD Acc.:' in text:
-                stats['takedown_accuracy'] = text.split('TD Acc.:')[1].strip()
-            elif 'TD Def.:' in text:
-                stats['takedown_defense'] = text.split('TD Def.:')[1].strip()
-            elif 'Sub. Avg.:' in text:
-                stats['submission_avg'] = text.split('Sub. Avg.:')[1].strip()
-    
-    return stats
+    return fetch_fighter(url).to_dict()
 
 
 def main():
@@ -97,34 +34,27 @@ def main():
         "Nasrat Haqparast": "http://ufcstats.com/fighter-details/4dea44a9e1d5b9f1",
     }
     
-    # Load existing data
-    try:
-        with open('../public/fighters_data.json', 'r', encoding='utf-8') as f:
-            existing = json.load(f)
-    except FileNotFoundError:
-        existing = []
-    
-    existing_names = {f['name'] for f in existing if 'name' in f}
+    store = MemoryFighterStore.load(policy=KEEP_NEWER)
     
     # Scrape and add new fighters
+    to_scrape = {}
     for name, url in fighters_to_add.items():
-        if name in existing_names:
+        if name in store:
             print(f"✓ {name} already in database")
             continue
-        
-        print(f"Scraping {name}...")
-        try:
-            stats = scrape_fighter(url)
-            existing.append(stats)
-            print(f"✓ Added {stats['name']}")
-        except Exception as e:
-            print(f"✗ Error scraping {name}: {e}")
+        to_scrape[url] = name
+    
+    for url, stats, error in get_fetcher().map(scrape_fighter, list(to_scrape)):
+        if error:
+            print(f"✗ Error scraping {to_scrape[url]}: {error}")
+            continue
+        store.upsert(stats)
+        print(f"✓ Added {stats['name']}")
     
-    # Save updated data
-    with open('../public/fighters_data.json', 'w', encoding='utf-8') as f:
-        json.dump(existing, indent=2, fp=f, ensure_ascii=False)
+    # Serialize once and atomically replace public/ and dist/ copies
+    store.save()
     
-    print(f"\n✅ Done! Total fighters: {len(existing)}")
+    print(f"\n✅ Done! Total fighters: {len(store)}")
 
 
 if __name__ == "__main__":
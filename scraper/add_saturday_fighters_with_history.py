@@ -1,220 +1,35 @@
-import requests
-from bs4 import BeautifulSoup
-import json
-import time
-import re
-from datetime import datetime
+from extractor import fetch_fighter
+from fetcher import get_fetcher
+from fighter_index import get_index
+from fighter_store import KEEP_RICHER, MemoryFighterStore
 
-def scrape_fight_history(soup):
-    """Extract last 3 fights from fighter page"""
-    fights = []
-    
-    try:
-        # Find the fight history table
-        fight_table = soup.find('table', class_='b-fight-details__table')
-        
-        if fight_table:
-            rows = fight_table.find_all('tr', class_='b-fight-details__table-row')[1:]  # Skip header
-            
-            # Get last 3 fights (or fewer if they don't have 3)
-            for row in rows[:3]:
-                cols = row.find_all('td')
-                
-                if len(cols) >= 2:
-                    fight_data = {}
-                    
-                    # Result (W/L/D/NC)
-                    result_col = cols[0]
-                    result_text = result_col.text.strip()
-                    if result_text:
-                        fight_data['result'] = result_text
-                    
-                    # Opponent name
-                    opponent_col = cols[1]
-                    opponent_link = opponent_col.find('a')
-                    if opponent_link:
-                        fight_data['opponent'] = opponent_link.text.strip()
-                    
-                    # Method (KO/TKO, SUB, DEC, etc)
-                    if len(cols) >= 7:
-                        method_col = cols[6]
-                        method_text = method_col.text.strip()
-                        # Parse method and round
-                        method_parts = method_text.split()
-                        if method_parts:
-                            fight_data['method'] = method_parts[0]
-                        
-                        # Round
-                        if len(cols) >= 8:
-                            round_col = cols[7]
-                            round_text = round_col.text.strip()
-                            if round_text:
-                                fight_data['round'] = round_text
-                    
-                    if fight_data:
-                        fights.append(fight_data)
-    
-    except Exception as e:
-        print(f"Error scraping fight history: {e}")
-    
-    return fights
+fetcher = get_fetcher()
 
-def calculate_age(dob_string):
-    """Calculate age from DOB string like 'Jan 22, 1993'"""
-    if not dob_string or dob_string == "--":
-        return None
-    
-    try:
-        # Parse the date
-        dob = datetime.strptime(dob_string, "%b %d, %Y")
-        today = datetime.now()
-        age = today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
-        return age
-    except:
-        return None
-
-def scrape_fighter_details(fighter_url, headers):
+def scrape_fighter_details(fighter_url):
     """Scrape detailed stats for a specific fighter"""
-    response = requests.get(fighter_url, headers=headers)
-    soup = BeautifulSoup(response.content, 'html.parser')
-    
-    stats = {}
-    
-    # Basic info
-    name_tag = soup.find('span', class_='b-content__title-highlight')
-    if name_tag:
-        stats['name'] = name_tag.text.strip()
-    
-    nickname_tag = soup.find('p', class_='b-content__Nickname')
-    if nickname_tag:
-        stats['nickname'] = nickname_tag.text.strip().replace('Nickname:', '').strip()
-    else:
-        stats['nickname'] = ""
-    
-    # Set defaults
-    stats['height'] = "--"
-    stats['weight'] = "--"
-    stats['reach'] = "--"
-    stats['stance'] = ""
-    stats['dob'] = "--"
-    stats['wins'] = 0
-    stats['losses'] = 0
-    stats['draws'] = 0
-    
-    # Fighter details
-    details_list = soup.find_all('li', class_='b-list__box-list-item')
-    for item in details_list:
-        label = item.text.strip()
-        
-        if 'Height:' in label:
-            stats['height'] = label.split('Height:')[1].strip()
-        elif 'Weight:' in label:
-            stats['weight'] = label.split('Weight:')[1].strip()
-        elif 'Reach:' in label:
-            stats['reach'] = label.split('Reach:')[1].strip()
-        elif 'STANCE:' in label:
-            stats['stance'] = label.split('STANCE:')[1].strip()
-        elif 'DOB:' in label:
-            stats['dob'] = label.split('DOB:')[1].strip()
-    
-    # Record
-    record_tag = soup.find('span', class_='b-content__title-record')
-    if record_tag:
-        record_text = record_tag.text.strip()
-        record_match = re.search(r'Record:\s*(\d+)-(\d+)-(\d+)', record_text)
-        if record_match:
-            stats['wins'] = int(record_match.group(1))
-            stats['losses'] = int(record_match.group(2))
-            stats['draws'] = int(record_match.group(3))
-    
-    # Career stats
-    stats['sig_strikes_landed_per_min'] = "0.00"
-    stats['striking_accuracy'] = "0%"
-    stats['sig_strikes_absorbed_per_min'] = "0.00"
-    stats['striking_defense'] = "0%"
-    stats['takedown_avg'] = "0.00"
-    stats['takedown_accuracy'] = "0%"
-    stats['takedown_defense'] = "0%"
-    stats['submission_avg'] = "0.0"
-    
-    career_stats = soup.find_all('div', class_='b-list__info-box-left')
-    for stat_box in career_stats:
-        items = stat_box.find_all('li', class_='b-list__box-list-item')
-        for item in items:
-            text = item.text.strip()
-            
-            if 'SLpM:' in text:
-                stats['sig_strikes_landed_per_min'] = text.split('SLpM:')[1].strip()
-            elif 'Str. Acc.:' in text:
-                stats['striking_accuracy'] = text.split('Str. Acc.:')[1].strip()
-            elif 'SApM:' in text:
-                stats['sig_strikes_absorbed_per_min'] = text.split('SApM:')[1].strip()
-            elif 'Str. Def:' in text:
-                stats['striking_defense'] = text.split('Str. Def:')[1].strip()
-            elif 'TD Avg.:' in text:
-                stats['takedown_avg'] = text.split('TD Avg.:')[1].strip()
-            elif 'TD Acc.:' in text:
-                stats['takedown_accuracy'] = text.split('TD Acc.:')[1].strip()
-            elif 'TD Def.:' in text:
-                stats['takedown_defense'] = text.split('TD Def.:')[1].strip()
-            elif 'Sub. Avg.:' in text:
-                stats['submission_avg'] = text.split('Sub. Avg.:')[1].strip()
-    
-    # Fight history - last 3 fights
-    stats['last_3_fights'] = scrape_fight_history(soup)
-    
-    # Calculate age from DOB
-    if stats.get('dob') and stats['dob'] != "--":
-        age = calculate_age(stats['dob'])
-        if age:
-            stats['age'] = age
-    
-    return stats
+    return fetch_fighter(fighter_url).to_dict()
 
 def search_and_scrape_fighters(names_to_find):
     """Search for specific fighters and scrape their data"""
-    base_url = "http://ufcstats.com/statistics/fighters"
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-    }
-    
-    letters = 'abcdefghijklmnopqrstuvwxyz'
     fighter_urls = {}
+    index = get_index()
     
     print("Searching for fighters...")
-    for letter in letters:
-        url = f"{base_url}?char={letter}&page=all"
-        response = requests.get(url, headers=headers)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        table = soup.find('table', class_='b-statistics__table')
-        if table:
-            rows = table.find_all('tr', class_='b-statistics__table-row')[1:]
-            
-            for row in rows:
-                cols = row.find_all('td')
-                if len(cols) >= 2:
-                    name_link = cols[0].find('a')
-                    if name_link:
-                        name = name_link.text.strip()
-                        # Check if this fighter matches any of our search names
-                        for search_name in names_to_find:
-                            if search_name.lower() == name.lower():
-                                fighter_urls[name] = name_link['href']
-                                print(f"✓ Found: {name}")
-        
-        time.sleep(0.5)
+    for search_name in names_to_find:
+        fighter = index.lookup(search_name)
+        if fighter:
+            fighter_urls[fighter['name']] = fighter['url']
+            print(f"✓ Found: {fighter['name']}")
     
     # Now scrape details for found fighters
     detailed_fighters = []
-    for name, url in fighter_urls.items():
-        print(f"Scraping details for {name}...")
-        try:
-            details = scrape_fighter_details(url, headers)
-            detailed_fighters.append(details)
-            time.sleep(1)
-        except Exception as e:
-            print(f"✗ Error scraping {name}: {e}")
+    names = {url: name for name, url in fighter_urls.items()}
+    for url, details, error in fetcher.map(scrape_fighter_details, list(names)):
+        if error:
+            print(f"✗ Error scraping {names[url]}: {error}")
+            continue
+        print(f"Scraped details for {names[url]}")
+        detailed_fighters.append(details)
     
     return detailed_fighters
 
@@ -285,33 +100,15 @@ def main():
             print(f"⚠ {fighter_data['name']} not found on UFC Stats, adding manually...")
             all_fighters.append(add_fighter_manually(**fighter_data))
     
-    # Load existing data
-    try:
-        with open('../public/fighters_data.json', 'r', encoding='utf-8') as f:
-            existing = json.load(f)
-    except FileNotFoundError:
-        existing = []
-    
-    existing_names = {f['name'] for f in existing if 'name' in f}
-    
-    # Add new fighters
-    added = 0
-    for fighter in all_fighters:
-        if fighter.get('name') and fighter['name'] not in existing_names:
-            existing.append(fighter)
-            added += 1
-            print(f"✓ Added {fighter['name']} to database")
-    
-    # Save updated data
-    with open('../public/fighters_data.json', 'w', encoding='utf-8') as f:
-        json.dump(existing, indent=2, fp=f, ensure_ascii=False)
+    # Scraped records replace stale placeholders; placeholders never replace real data
+    store = MemoryFighterStore.load(policy=KEEP_RICHER)
+    outcomes = store.upsert_many(fighter for fighter in all_fighters if fighter.get('name'))
     
-    # Copy to dist folder
-    with open('../dist/fighters_data.json', 'w', encoding='utf-8') as f:
-        json.dump(existing, indent=2, fp=f, ensure_ascii=False)
+    # Serialize once and atomically replace public/ and dist/ copies
+    store.save()
     
-    print(f"\n✅ Done! Added {added} new fighters")
-    print(f"Total fighters in database: {len(existing)}")
+    print(f"\n✅ Done! Added {outcomes['inserted']} new fighters, updated {outcomes['updated']}")
+    print(f"Total fighters in database: {len(store)}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,174 @@
+import asyncio
+import functools
+import time
+
+import aiohttp
+
+from fetcher import DEFAULT_HEADERS
+from http_cache import HTTPCache
+from journal import open_journal
+from publish import publish
+from ufc_scraper import UFCScraper
+
+
+class AsyncRateLimiter:
+    """Event-loop version of fetcher.RateLimiter: spaces requests under a requests-per-second cap"""
+
+    def __init__(self, requests_per_second):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self.next_slot = 0.0
+
+    async def wait(self):
+        if not self.interval:
+            return
+
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        slot = max(now, self.next_slot)
+        self.next_slot = slot + self.interval
+
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class AsyncCrawler:
+    """Fetch ufcstats pages as coroutines and parse them off the event loop"""
+
+    def __init__(self, concurrency=20, requests_per_second=4, timeout=30, retries=3, scraper=None, cache=None):
+        self.concurrency = concurrency
+        self.cache = cache if cache is not None else HTTPCache()
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.retries = retries
+        self.limiter = AsyncRateLimiter(requests_per_second)
+        # Only used for its base_url and parse_* methods; requests go through aiohttp
+        self.scraper = scraper or UFCScraper()
+        self.semaphore = None
+        self.session = None
+
+    async def fetch(self, url, max_age=None):
+        """GET a URL with at most `concurrency` requests in flight, retrying 429/5xx with backoff
+
+        max_age overrides the cache TTL, e.g. 0 to always revalidate a listing page.
+        """
+        entry = self.cache.get(url) if self.cache else None
+        if entry and self.cache.is_fresh(entry, max_age):
+            return entry['body']
+        headers = self.cache.validators(entry) if entry else None
+
+        for attempt in range(self.retries + 1):
+            async with self.semaphore:
+                await self.limiter.wait()
+                async with self.session.get(url, headers=headers) as response:
+                    if response.status == 304 and entry:
+                        self.cache.touch(url)
+                        return entry['body']
+                    if response.status not in (429, 500, 502, 503, 504) or attempt == self.retries:
+                        response.raise_for_status()
+                        body = await response.read()
+                        if self.cache:
+                            self.cache.store(url, body, response.headers)
+                        return body
+                    retry_after = response.headers.get('Retry-After')
+
+            delay = float(retry_after) if retry_after and retry_after.isdigit() else 2 ** attempt
+            await asyncio.sleep(delay)
+
+    async def parse(self, func, html):
+        """Run a BeautifulSoup parse function in the default executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, func, html)
+
+    async def scrape_fighters_list(self, letter):
+        html = await self.fetch(f"{self.scraper.base_url}?char={letter}&page=all")
+        return await self.parse(self.scraper.parse_fighters_list, html)
+
+    async def scrape_fighter_details(self, fighter_url):
+        html = await self.fetch(fighter_url)
+        return await self.parse(functools.partial(self.scraper.parse_fighter_details, fighter_url=fighter_url), html)
+
+    async def scrape_all_fighters(self, limit=None, journal=None):
+        """Async counterpart of UFCScraper.scrape_all_fighters"""
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        async with aiohttp.ClientSession(headers=DEFAULT_HEADERS, timeout=self.timeout) as session:
+            self.session = session
+
+            letters = 'abcdefghijklmnopqrstuvwxyz'
+            print("Scraping fighters list...")
+            listings = await asyncio.gather(
+                *(self.scrape_fighters_list(letter) for letter in letters),
+                return_exceptions=True,
+            )
+
+            all_fighters = []
+            for letter, fighters in zip(letters, listings):
+                if isinstance(fighters, Exception):
+                    print(f"Error fetching fighters starting with '{letter.upper()}': {fighters}")
+                    continue
+                all_fighters.extend(fighters)
+
+            print(f"\nFound {len(all_fighters)} fighters total.")
+
+            if limit:
+                all_fighters = all_fighters[:limit]
+                print(f"Limiting to {limit} fighters for testing.")
+
+            # Detail pages go through a bounded queue drained by `concurrency` workers,
+            # so we never hold more than a handful of pending coroutines at once
+            queue = asyncio.Queue(maxsize=self.concurrency * 2)
+            details_by_url = {}
+            done = 0
+            pending = all_fighters
+
+            if journal is not None:
+                details_by_url = {f['url']: journal.done[f['url']] for f in all_fighters if f['url'] in journal}
+                pending = [f for f in all_fighters if f['url'] not in journal]
+                if details_by_url:
+                    print(f"Skipping {len(details_by_url)} fighters already in the journal")
+
+            async def worker():
+                nonlocal done
+                while True:
+                    fighter = await queue.get()
+                    try:
+                        details = await self.scrape_fighter_details(fighter['url'])
+                        if journal is not None:
+                            journal.record(fighter['url'], details)
+                        details_by_url[fighter['url']] = details
+                        done += 1
+                        print(f"Scraped details for {fighter['name']} ({done}/{len(pending)})")
+                    except Exception as e:
+                        print(f"Error scraping {fighter['name']}: {e}")
+                    finally:
+                        queue.task_done()
+
+            workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+            for fighter in pending:
+                await queue.put(fighter)
+            await queue.join()
+
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        self.session = None
+        return [details_by_url[f['url']] for f in all_fighters if f['url'] in details_by_url]
+
+
+def scrape_all_fighters_async(limit=None, concurrency=20, requests_per_second=4, journal=None):
+    """Scrape every fighter on a single event loop; returns the same dicts as scrape_fighter_details"""
+    crawler = AsyncCrawler(concurrency=concurrency, requests_per_second=requests_per_second)
+    return asyncio.run(crawler.scrape_all_fighters(limit=limit, journal=journal))
+
+
+def main():
+    start = time.monotonic()
+    journal = open_journal('async_scraper')
+    fighters = scrape_all_fighters_async(limit=500, journal=journal)
+    print(f"\nScraped {len(fighters)} fighters in {time.monotonic() - start:.1f}s")
+
+    publish(fighters)
+    journal.discard()
+
+
+if __name__ == "__main__":
+    main()
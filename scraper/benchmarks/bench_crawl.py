@@ -0,0 +1,134 @@
+"""Offline scraper benchmark: parse throughput, full crawls at several concurrency levels, peak memory
+
+Crawls run against benchmarks/stub_server.py serving the recorded corpus, so results
+are reproducible with no network. The committed corpus is synthetic (make_fixtures.py);
+record_fixtures.py replaces it with real pages.
+
+Usage (from scraper/):
+    python benchmarks/bench_crawl.py
+    python benchmarks/bench_crawl.py --limit 500 --concurrency 1 8 32 --latency 0.1 --throttle-every 25
+"""
+import argparse
+import asyncio
+import contextlib
+import glob
+import io
+import os
+import resource
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from async_scraper import AsyncCrawler  # noqa: E402
+from extractor import extract_fighter  # noqa: E402
+from fetcher import Fetcher  # noqa: E402
+from fighter_index import LETTERS, parse_listing  # noqa: E402
+from stub_server import FIXTURES_DIR, StubServer  # noqa: E402
+from ufc_scraper import UFCScraper  # noqa: E402
+
+
+def bench_parse(repeat=3):
+    """Best-of-`repeat` pages/sec for extracting the recorded fighter and listing pages"""
+    results = {}
+    for kind, parse in (('fighters', extract_fighter), ('listing', parse_listing)):
+        pages = []
+        for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, kind, '*.html'))):
+            with open(path, 'rb') as f:
+                pages.append(f.read())
+        if not pages:
+            continue
+
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for html in pages:
+                parse(html)
+            best = min(best, time.perf_counter() - start)
+        results[kind] = (len(pages), len(pages) / best)
+    return results
+
+
+def crawl_threaded(base_url, concurrency, limit):
+    fetcher = Fetcher(max_workers=concurrency, requests_per_second=0)
+    scraper = UFCScraper(fetcher)
+    scraper.base_url = f"{base_url}/statistics/fighters"
+    try:
+        return scraper.scrape_all_fighters(limit=limit)
+    finally:
+        fetcher.close()
+
+
+def crawl_async(base_url, concurrency, limit):
+    scraper = UFCScraper()
+    scraper.base_url = f"{base_url}/statistics/fighters"
+    crawler = AsyncCrawler(concurrency=concurrency, requests_per_second=0, scraper=scraper, cache=False)
+    return asyncio.run(crawler.scrape_all_fighters(limit=limit))
+
+
+CRAWLERS = {'threads': crawl_threaded, 'asyncio': crawl_async}
+
+
+def run_crawl(crawl, base_url, concurrency, limit, trace=False):
+    """(fighters scraped, seconds, peak traced MB or None) for one quiet crawl"""
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fighters = crawl(base_url, concurrency, limit)
+    elapsed = time.perf_counter() - start
+    peak = None
+    if trace:
+        peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+    return len(fighters), elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline scraper benchmark against the recorded corpus")
+    parser.add_argument('--limit', type=int, default=200, help="fighter detail pages per crawl (default: 200)")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 8, 16, 32])
+    parser.add_argument('--crawler', choices=sorted(CRAWLERS), nargs='+', default=sorted(CRAWLERS, reverse=True))
+    parser.add_argument('--latency', type=float, default=0.05, help="seconds the stub adds per response (default: 0.05)")
+    parser.add_argument('--throttle-every', type=int, default=0, help="stub answers every Nth request with a 429")
+    parser.add_argument('--retry-after', type=int, default=1, help="Retry-After seconds sent with a 429")
+    args = parser.parse_args()
+
+    parse_results = bench_parse()
+    if not parse_results:
+        print(f"No recorded pages under {FIXTURES_DIR}; run benchmarks/make_fixtures.py or record_fixtures.py first")
+        return
+
+    print("Parse only")
+    for kind, (count, rate) in parse_results.items():
+        print(f"  {kind:<10} {count:5d} pages  {rate:8.1f} pages/s")
+
+    print(f"\nCrawl: {args.limit} fighters + {len(LETTERS)} listing pages, "
+          f"{args.latency * 1000:.0f} ms latency, 429 every {args.throttle_every or '-'} requests")
+
+    for name in args.crawler:
+        crawl = CRAWLERS[name]
+        for concurrency in args.concurrency:
+            with StubServer(latency=args.latency, throttle_every=args.throttle_every,
+                            retry_after=args.retry_after) as stub:
+                scraped, elapsed, _ = run_crawl(crawl, stub.base_url, concurrency, args.limit)
+                pages = stub.requests - stub.throttled
+                print(f"  {name:<8} x{concurrency:<3} {scraped:5d} fighters  {elapsed:7.2f} s  "
+                      f"{pages / elapsed:8.1f} pages/s  {stub.throttled:4d} throttled")
+
+    # tracemalloc slows everything down, so memory gets its own run at the highest concurrency
+    print("\nPeak memory")
+    concurrency = max(args.concurrency)
+    for name in args.crawler:
+        with StubServer(latency=args.latency) as stub:
+            _, _, peak = run_crawl(CRAWLERS[name], stub.base_url, concurrency, args.limit, trace=True)
+        print(f"  {name:<8} x{concurrency:<3} {peak:8.1f} MB traced Python allocations")
+
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"  process max RSS {maxrss / (2 ** 20 if sys.platform == 'darwin' else 2 ** 10):8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
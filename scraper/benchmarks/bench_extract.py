@@ -0,0 +1,136 @@
+"""Throughput of the shared extractor against the per-script copies it replaced
+
+The legacy path below is the scrape_fighter_details + scrape_fight_history pair that
+used to be duplicated across five scripts: a full html.parser tree, two find_all
+passes over the list items and a chain of 'X:' in text / split checks.
+
+Usage (from scraper/):
+    python benchmarks/bench_extract.py                   # fighter pages under benchmarks/fixtures/
+    python benchmarks/bench_extract.py page1.html page2.html
+"""
+import glob
+import os
+import re
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extractor import extract_fighter  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+LEGACY_LABELS = [
+    ('SLpM:', 'sig_strikes_landed_per_min'),
+    ('Str. Acc.:', 'striking_accuracy'),
+    ('SApM:', 'sig_strikes_absorbed_per_min'),
+    ('Str. Def:', 'striking_defense'),
+    ('TD Avg.:', 'takedown_avg'),
+    ('TD Acc.:', 'takedown_accuracy'),
+    ('TD Def.:', 'takedown_defense'),
+    ('Sub. Avg.:', 'submission_avg'),
+]
+
+
+def legacy_extract(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    stats = {}
+
+    name_tag = soup.find('span', class_='b-content__title-highlight')
+    if name_tag:
+        stats['name'] = name_tag.text.strip()
+
+    nickname_tag = soup.find('p', class_='b-content__Nickname')
+    if nickname_tag:
+        stats['nickname'] = nickname_tag.text.strip().replace('Nickname:', '').strip()
+
+    for item in soup.find_all('li', class_='b-list__box-list-item'):
+        label = item.text.strip()
+        for marker, key in [('Height:', 'height'), ('Weight:', 'weight'), ('Reach:', 'reach'),
+                            ('STANCE:', 'stance'), ('DOB:', 'dob')]:
+            if marker in label:
+                stats[key] = label.split(marker)[1].strip()
+                break
+
+    record_tag = soup.find('span', class_='b-content__title-record')
+    if record_tag:
+        record_match = re.search(r'Record:\s*(\d+)-(\d+)-(\d+)', record_tag.text.strip())
+        if record_match:
+            stats['wins'] = int(record_match.group(1))
+            stats['losses'] = int(record_match.group(2))
+            stats['draws'] = int(record_match.group(3))
+
+    for stat_box in soup.find_all('div', class_='b-list__info-box-left'):
+        for item in stat_box.find_all('li', class_='b-list__box-list-item'):
+            text = item.text.strip()
+            for marker, key in LEGACY_LABELS:
+                if marker in text:
+                    stats[key] = text.split(marker)[1].strip()
+                    break
+
+    fights = []
+    fight_table = soup.find('table', class_='b-fight-details__table')
+    if fight_table:
+        for row in fight_table.find_all('tr', class_='b-fight-details__table-row')[1:][:3]:
+            cols = row.find_all('td')
+            if len(cols) >= 2:
+                fight = {'result': cols[0].text.strip()}
+                opponent_link = cols[1].find('a')
+                if opponent_link:
+                    fight['opponent'] = opponent_link.text.strip()
+                fights.append(fight)
+    stats['last_3_fights'] = fights
+
+    return stats
+
+
+def time_per_page(func, pages, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for html in pages:
+            func(html)
+        best = min(best, time.perf_counter() - start)
+    return best / len(pages)
+
+
+def main():
+    paths = sys.argv[1:] or sorted(glob.glob(os.path.join(FIXTURES_DIR, '**', '*.html'), recursive=True))
+    pages = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            html = f.read()
+        if b'b-content__title-highlight' in html:
+            pages.append(html)
+
+    if not pages:
+        print(f"No fighter pages to benchmark. Pass HTML files or record fixtures into {FIXTURES_DIR}")
+        return
+
+    # The extractor must agree with the old code on every bio and career field
+    for html in pages:
+        legacy = legacy_extract(html)
+        current = extract_fighter(html).to_dict()
+        mismatched = [key for key, value in legacy.items() if key != 'last_3_fights' and current.get(key) != value]
+        if mismatched:
+            print(f"✗ Extractor disagrees with legacy code on {', '.join(mismatched)} for {current['name']}")
+            return
+
+    candidates = [
+        ('legacy copies (html.parser)', legacy_extract),
+        ('extractor, html.parser', lambda html: extract_fighter(html, fast=False)),
+        ('extractor, lxml strained', extract_fighter),
+    ]
+
+    print(f"fighter pages: {len(pages)}")
+    baseline = None
+    for label, func in candidates:
+        per_page = time_per_page(func, pages)
+        baseline = baseline or per_page
+        print(f"  {label:<28} {per_page * 1000:8.2f} ms/page  {1 / per_page:8.1f} pages/s  {baseline / per_page:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
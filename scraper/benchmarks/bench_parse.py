@@ -0,0 +1,82 @@
+"""Per-page parse time of the html.parser full-tree path against the lxml strained path
+
+Usage (from scraper/):
+    python benchmarks/bench_parse.py                     # every page under benchmarks/fixtures/
+    python benchmarks/bench_parse.py page1.html page2.html
+"""
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parsing import FIGHTER_PAGE, LISTING_PAGE, make_soup  # noqa: E402
+from ufc_scraper import UFCScraper  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def load_pages(paths):
+    pages = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            html = f.read()
+        kind = 'listing' if b'b-statistics__table' in html else 'fighter'
+        pages.append((path, kind, html))
+    return pages
+
+
+def time_per_page(func, pages, repeat):
+    """Best-of-`repeat` seconds per page for func(kind, html) over all pages"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _, kind, html in pages:
+            func(kind, html)
+        best = min(best, time.perf_counter() - start)
+    return best / len(pages)
+
+
+def main():
+    paths = sys.argv[1:] or sorted(glob.glob(os.path.join(FIXTURES_DIR, '**', '*.html'), recursive=True))
+    if not paths:
+        print(f"No pages to benchmark. Pass HTML files or record fixtures into {FIXTURES_DIR}")
+        return
+
+    pages = load_pages(paths)
+    full = UFCScraper(fast_parse=False)
+    fast = UFCScraper(fast_parse=True)
+
+    # Both paths must extract the same data before their timings mean anything
+    for path, kind, html in pages:
+        parse = 'parse_fighters_list' if kind == 'listing' else 'parse_fighter_details'
+        if getattr(full, parse)(html) != getattr(fast, parse)(html):
+            print(f"✗ Fast parse output differs from full parse for {path}")
+            return
+
+    strainers = {'listing': LISTING_PAGE, 'fighter': FIGHTER_PAGE}
+    candidates = [
+        ('html.parser, full tree', lambda kind, html: make_soup(html, fast=False)),
+        ('lxml, full tree', lambda kind, html: make_soup(html)),
+        ('lxml, strained subtrees', lambda kind, html: make_soup(html, strainers[kind])),
+        ('extract, html.parser', lambda kind, html: full.parse_fighter_details(html) if kind == 'fighter' else full.parse_fighters_list(html)),
+        ('extract, lxml strained', lambda kind, html: fast.parse_fighter_details(html) if kind == 'fighter' else fast.parse_fighters_list(html)),
+    ]
+
+    for kind in ('fighter', 'listing'):
+        subset = [page for page in pages if page[1] == kind]
+        if not subset:
+            continue
+
+        repeat = 5 if kind == 'fighter' else 2
+        print(f"\n{kind} pages: {len(subset)}")
+        baseline = None
+        for label, func in candidates:
+            per_page = time_per_page(func, subset, repeat)
+            baseline = baseline or per_page
+            print(f"  {label:<26} {per_page * 1000:8.2f} ms/page  {1 / per_page:8.1f} pages/s  {baseline / per_page:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
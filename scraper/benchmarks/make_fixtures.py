@@ -0,0 +1,188 @@
+"""Generate the committed synthetic corpus under benchmarks/fixtures/
+
+The pages follow ufcstats.com's markup (class names, table layout, list items, the
+'next' row of an upcoming bout) closely enough for every parser and the stub server,
+and are generated from a fixed seed, so the benchmarks and the before/after output
+checks run the same pages everywhere with no network. record_fixtures.py replaces
+them with real pages when the site is reachable.
+
+Usage (from scraper/):
+    python benchmarks/make_fixtures.py                   # 26 listing pages + 24 fighter pages
+    python benchmarks/make_fixtures.py --fighters 100
+"""
+import argparse
+import os
+import random
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+SITE = 'http://ufcstats.com'
+
+FIRST_NAMES = ['Tom', 'Danny', 'Chang-Ho', 'José', 'Seok Hyeon', 'Waldo', 'Mizuki', 'Ketlen', 'Umar', 'Ciryl',
+               'Nasrat', 'Jailton', 'Mario', 'Ludovit', 'Azat', 'Ikram', 'JunYong', 'Aleksandar', 'Norma',
+               'Montserrat', 'Kevin', 'Rafael', 'Yadier', 'Themba', 'Ante', 'David']
+LAST_NAMES = ['Aaron', 'Bautista', 'Cortes Acosta', 'Dumont', 'Estevam', 'Frunza', 'Gane', 'Haqparast', 'Inoue',
+              'Jandiroba', 'Klein', 'Lee', 'Maksum', 'Nurmagomedov', 'Onama', 'Park', 'Quiñones', 'Rakic',
+              'Silva', 'Teixeira', 'Usman', 'Volkov', 'Wood', 'Xavier', 'Yan', 'Zahabi']
+NICKNAMES = ['', '', 'The Spartan', 'Fresh', 'Imortal', 'Conejo', 'The Messenger', 'Puro Osso', 'Mean Machine']
+STANCES = ['Orthodox', 'Orthodox', 'Southpaw', 'Switch', '']
+METHODS = [('U-DEC', ''), ('S-DEC', ''), ('KO/TKO', 'Punches'), ('KO/TKO', 'Head Kick'),
+           ('SUB', 'Rear Naked Choke'), ('SUB', 'Guillotine Choke'), ('M-DEC', ''), ('Overturned', '')]
+MONTHS = ['Jan.', 'Feb.', 'Mar.', 'Apr.', 'May.', 'Jun.', 'Jul.', 'Aug.', 'Sep.', 'Oct.', 'Nov.', 'Dec.']
+
+NAV = ''.join(f'<li class="b-statistics__nav-item"><a class="b-statistics__nav-link" href="{SITE}/statistics/{page}">'
+              f'{page.title()}</a></li>' for page in ('events', 'fighters', 'fights', 'rankings'))
+HEADER = (f'<header class="b-header"><div class="l-page__container"><a class="b-logo" href="{SITE}">UFC Stats</a>'
+          f'<ul class="b-statistics__nav-items">{NAV}</ul></div></header>')
+FOOTER = ('<footer class="b-footer"><div class="l-page__container">'
+          + '<p class="b-footer__text">Copyright © Zuffa LLC. All rights reserved.</p>' * 20
+          + '</div></footer><script src="/static/js/main.js"></script>')
+
+
+def page(title, body):
+    return (f'<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>{title}</title>'
+            f'<link rel="stylesheet" href="/static/css/main.css"></head><body>{HEADER}'
+            f'<section class="b-statistics__section_details"><div class="l-page__container">{body}</div></section>'
+            f'{FOOTER}</body></html>')
+
+
+def make_roster(rng):
+    """Fighters for every letter: {'id', 'first', 'last', 'nickname', ...}"""
+    roster = []
+    for letter_index in range(26):
+        for _ in range(rng.randint(6, 10)):
+            first = rng.choice(FIRST_NAMES)
+            last = rng.choice([name for name in LAST_NAMES if name[0] == LAST_NAMES[letter_index][0]] or LAST_NAMES)
+            roster.append({
+                'id': '%016x' % rng.getrandbits(64),
+                'first': first,
+                'last': last,
+                'nickname': rng.choice(NICKNAMES),
+                'height': rng.choice(['--', "5' 4\"", "5' 8\"", "5' 11\"", "6' 1\"", "6' 4\""]),
+                'weight': rng.choice(['125 lbs.', '135 lbs.', '155 lbs.', '170 lbs.', '185 lbs.', '265 lbs.']),
+                'reach': rng.choice(['--', '66.0"', '70.0"', '72.0"', '76.0"', '80.0"']),
+                'stance': rng.choice(STANCES),
+                'wins': rng.randint(0, 30),
+                'losses': rng.randint(0, 12),
+                'draws': rng.choice([0, 0, 0, 1]),
+            })
+    return roster
+
+
+def listing_page(letter, fighters):
+    cell = '<td class="b-statistics__table-col">{}</td>'
+    link = '<td class="b-statistics__table-col"><a href="{}/fighter-details/{}" class="b-link b-link_style_black">{}</a></td>'
+    rows = ''.join(
+        '<tr class="b-statistics__table-row">'
+        + link.format(SITE, f['id'], f['first']) + link.format(SITE, f['id'], f['last'])
+        + link.format(SITE, f['id'], f['nickname'])
+        + ''.join(cell.format(f[key]) for key in ('height', 'weight', 'reach', 'stance', 'wins', 'losses', 'draws'))
+        + cell.format('') + '</tr>'
+        for f in fighters
+    )
+    head = ''.join(f'<th class="b-statistics__table-col">{name}</th>'
+                   for name in ('First', 'Last', 'Nickname', 'Ht.', 'Wt.', 'Reach', 'Stance', 'W', 'L', 'D', 'Belt'))
+    return page('UFC Stats', f'<div class="b-statistics__sub-nav">{letter.upper()}</div>'
+                f'<table class="b-statistics__table"><thead><tr class="b-statistics__table-row">{head}</tr></thead>'
+                f'<tbody><tr class="b-statistics__table-row"><td class="b-statistics__table-col_type_clear"></td></tr>'
+                f'{rows}</tbody></table>')
+
+
+def text_cell(*lines, align=False):
+    cls = 'b-fight-details__table-col' + (' l-page_align_left' if align else '')
+    return f'<td class="{cls}">' + ''.join(f'<p class="b-fight-details__table-text">{line}</p>' for line in lines) + '</td>'
+
+
+def history_row(rng, fighter, opponent, result, year):
+    fight_id = '%016x' % rng.getrandbits(64)
+    url = f'{SITE}/fight-details/{fight_id}'
+    name = f"{fighter['first']} {fighter['last']}"
+    opponent_name = f"{opponent['first']} {opponent['last']}"
+    fighters = text_cell(
+        f'<a class="b-link b-link_style_black" href="{SITE}/fighter-details/{fighter["id"]}">{name}</a>',
+        f'<a class="b-link b-link_style_black" href="{SITE}/fighter-details/{opponent["id"]}">{opponent_name}</a>',
+        align=True)
+    date = f"{rng.choice(MONTHS)} {rng.randint(1, 28):02d}, {year}"
+    event = text_cell(f'<a class="b-link b-link_style_black" href="{SITE}/event-details/{rng.getrandbits(64):016x}">'
+                      f'UFC Fight Night: {fighter["last"]} vs. {opponent["last"]}</a>', date, align=True)
+
+    if result == 'next':
+        flag = '<a class="b-flag b-flag_style_bordered" href="{}"><i class="b-flag__inner"><i class="b-flag__text">next</i></i></a>'
+        return (f'<tr class="b-fight-details__table-row b-fight-details__table-row__hover js-fight-details-click" data-link="{url}">'
+                f'{text_cell(flag.format(url))}{fighters}' + text_cell('', '') * 4 + event + text_cell('') * 3 + '</tr>')
+
+    style = {'win': 'green', 'loss': 'red'}.get(result, 'gray')
+    flag = f'<a class="b-flag b-flag_style_{style}" href="{url}"><i class="b-flag__inner"><i class="b-flag__text">{result}</i></i></a>'
+    method, detail = rng.choice(METHODS)
+    rnd = 3 if 'DEC' in method else rng.randint(1, 3)
+    time = '5:00' if 'DEC' in method else f"{rng.randint(0, 4)}:{rng.randint(0, 59):02d}"
+    stats = ''.join(text_cell(rng.randint(0, n), rng.randint(0, n)) for n in (2, 80, 5, 3))
+    return (f'<tr class="b-fight-details__table-row b-fight-details__table-row__hover js-fight-details-click" data-link="{url}">'
+            f'{text_cell(flag)}{fighters}{stats}{event}{text_cell(method, detail, align=True)}'
+            f'{text_cell(rnd)}{text_cell(time)}</tr>')
+
+
+def fighter_page(rng, fighter, roster):
+    item = ('<li class="b-list__box-list-item b-list__box-list-item_type_block">'
+            '<i class="b-list__box-item-title b-list__box-item-title_type_width">{}</i>\n          {}\n        </li>')
+    dob = '--' if rng.random() < 0.1 else f"{rng.choice(MONTHS)[:3]} {rng.randint(1, 28):02d}, {rng.randint(1980, 2002)}"
+    bio = ''.join(item.format(label, fighter[key] if key else dob) for label, key in
+                  (('Height:', 'height'), ('Weight:', 'weight'), ('Reach:', 'reach'), ('STANCE:', 'stance'), ('DOB:', None)))
+    career = [('SLpM:', f"{rng.uniform(0, 7):.2f}"), ('Str. Acc.:', f"{rng.randint(20, 65)}%"),
+              ('SApM:', f"{rng.uniform(0, 7):.2f}"), ('Str. Def:', f"{rng.randint(30, 70)}%"),
+              ('', '&nbsp;'), ('TD Avg.:', f"{rng.uniform(0, 5):.2f}"), ('TD Acc.:', f"{rng.randint(0, 80)}%"),
+              ('TD Def.:', f"{rng.randint(0, 100)}%"), ('Sub. Avg.:', f"{rng.uniform(0, 2):.1f}")]
+    stats = ''.join(item.format(label, value) for label, value in career)
+
+    bouts = min(fighter['wins'] + fighter['losses'] + fighter['draws'], 25)
+    results = [rng.choice(['win', 'win', 'loss', 'draw', 'nc'] if i % 7 == 6 else ['win', 'loss']) for i in range(bouts)]
+    if rng.random() < 0.3:
+        results.insert(0, 'next')
+    rows = ''.join(history_row(rng, fighter, rng.choice(roster), result, 2025 - i // 2)
+                   for i, result in enumerate(results))
+
+    nickname = f'<p class="b-content__Nickname">\n      {fighter["nickname"]}\n    </p>'
+    head = ''.join(f'<th class="b-fight-details__table-col">{name}</th>'
+                   for name in ('W/L', 'Fighter', 'Kd', 'Str', 'Td', 'Sub', 'Event', 'Method', 'Round', 'Time'))
+    return page(f"{fighter['first']} {fighter['last']}", (
+        f'<h2 class="b-content__title"><span class="b-content__title-highlight">\n      '
+        f'{fighter["first"]} {fighter["last"]}\n    </span><span class="b-content__title-record">\n      '
+        f'Record: {fighter["wins"]}-{fighter["losses"]}-{fighter["draws"]}\n    </span></h2>{nickname}'
+        f'<div class="b-fight-details b-fight-details_margin-top">'
+        f'<div class="b-list__info-box b-list__info-box_style_small-width js-guide"><ul class="b-list__box-list">{bio}</ul></div>'
+        f'<div class="b-list__info-box b-list__info-box_style_middle-width js-guide clearfix">'
+        f'<i class="b-list__box-item-title">Career statistics:</i><ul class="b-list__box-list b-list__box-list_margin-top">'
+        f'{stats}</ul></div></div>'
+        f'<section class="b-fight-details"><table class="b-fight-details__table b-fight-details__table_style_margin-top '
+        f'b-fight-details__table_type_event-details js-fight-table"><thead class="b-fight-details__table-head">'
+        f'<tr class="b-fight-details__table-row">{head}</tr></thead><tbody class="b-fight-details__table-body">'
+        f'<tr class="b-fight-details__table-row"><td class="b-fight-details__table-col"></td></tr>{rows}</tbody></table></section>'
+    ))
+
+
+def save(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the synthetic ufcstats-shaped benchmark corpus")
+    parser.add_argument('--fighters', type=int, default=24, help="fighter pages to generate (default: 24)")
+    parser.add_argument('--seed', type=int, default=2024)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    roster = make_roster(rng)
+    for letter in 'abcdefghijklmnopqrstuvwxyz':
+        fighters = [f for f in roster if f['last'][0].lower() == letter]
+        save(os.path.join(FIXTURES_DIR, 'listing', f"{letter}.html"), listing_page(letter, fighters))
+
+    step = max(1, len(roster) // args.fighters)
+    for fighter in roster[::step][:args.fighters]:
+        save(os.path.join(FIXTURES_DIR, 'fighters', f"{fighter['id']}.html"), fighter_page(rng, fighter, roster))
+
+    print(f"✅ {len(roster)} listed fighters, {min(args.fighters, len(roster[::step]))} fighter pages under {FIXTURES_DIR}")
+
+
+if __name__ == "__main__":
+    main()
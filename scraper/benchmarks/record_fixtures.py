@@ -0,0 +1,64 @@
+"""Record the benchmark corpus from the live site: every A-Z listing page plus a sample of fighter pages
+
+Pages are saved exactly as ufcstats.com served them, so the benchmarks (and the stub
+server) run the real markup with no network. Run once with network access:
+
+Usage (from scraper/):
+    python benchmarks/record_fixtures.py                 # 26 listing pages + 100 fighter pages
+    python benchmarks/record_fixtures.py --fighters 300
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extractor import fighter_id_from_url  # noqa: E402
+from fetcher import Fetcher  # noqa: E402
+from fighter_index import LETTERS, LISTING_URL, parse_listing  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+LISTING_DIR = os.path.join(FIXTURES_DIR, 'listing')
+FIGHTERS_DIR = os.path.join(FIXTURES_DIR, 'fighters')
+
+
+def save(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(content)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record listing and fighter pages for the offline benchmarks")
+    parser.add_argument('--fighters', type=int, default=100, help="fighter pages to record (default: 100)")
+    args = parser.parse_args()
+
+    # No page cache: the corpus should be what the site serves right now
+    fetcher = Fetcher()
+
+    listing = []
+    for letter, response, error in fetcher.map(lambda letter: fetcher.get(LISTING_URL.format(letter=letter)), LETTERS):
+        if error:
+            print(f"✗ Listing '{letter.upper()}': {error}")
+            continue
+        save(os.path.join(LISTING_DIR, f"{letter}.html"), response.content)
+        listing.extend(parse_listing(response.content))
+        print(f"Recorded listing '{letter.upper()}'")
+
+    # Spread the sample across the alphabet rather than taking the first N 'A' fighters
+    step = max(1, len(listing) // args.fighters) if args.fighters else len(listing) + 1
+    urls = [fighter['url'] for fighter in listing[::step][:args.fighters]]
+
+    for i, (url, response, error) in enumerate(fetcher.map(fetcher.get, urls), 1):
+        if error:
+            print(f"✗ {url}: {error}")
+            continue
+        save(os.path.join(FIGHTERS_DIR, f"{fighter_id_from_url(url)}.html"), response.content)
+        print(f"Recorded fighter page {i}/{len(urls)}")
+
+    fetcher.close()
+    print(f"\n✅ Corpus saved under {FIXTURES_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Local stand-in for ufcstats.com serving the recorded corpus, with added latency and throttling
+
+Listing pages are served at /statistics/fighters?char=X and fighter pages at
+/fighter-details/<id>. Fighters on the listing whose page wasn't recorded get one of
+the recorded pages (picked by id, so always the same one), which lets a full crawl
+run against real markup. Links to ufcstats.com are rewritten to point back here.
+
+Usage (from scraper/):
+    python benchmarks/stub_server.py --port 8765 --latency 0.05 --throttle-every 20
+"""
+import argparse
+import glob
+import hashlib
+import os
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+SITE = b'http://ufcstats.com'
+
+
+class StubServer:
+    """Serve the fixture corpus from a background thread
+
+    latency is added to every response; with throttle_every=N every Nth request is
+    answered 429 with a Retry-After of retry_after seconds, like the live site under load.
+    """
+
+    def __init__(self, fixtures_dir=FIXTURES_DIR, latency=0.0, throttle_every=0, retry_after=1, port=0):
+        self.fixtures_dir = fixtures_dir
+        self.latency = latency
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.port = port
+        self.server = None
+        self.thread = None
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.throttled = 0
+
+    def load(self, base_url):
+        def read(path):
+            with open(path, 'rb') as f:
+                return f.read().replace(SITE, base_url.encode())
+
+        self.listings = {
+            os.path.splitext(os.path.basename(path))[0]: read(path)
+            for path in glob.glob(os.path.join(self.fixtures_dir, 'listing', '*.html'))
+        }
+        self.fighters = {
+            os.path.splitext(os.path.basename(path))[0]: read(path)
+            for path in sorted(glob.glob(os.path.join(self.fixtures_dir, 'fighters', '*.html')))
+        }
+        self.fallback = list(self.fighters.values())
+        if not self.listings or not self.fighters:
+            raise FileNotFoundError(f"No recorded pages under {self.fixtures_dir}; run benchmarks/make_fixtures.py or record_fixtures.py first")
+
+    def page(self, path, query):
+        """Body for a request path, or None for a 404"""
+        if path == '/statistics/fighters':
+            return self.listings.get(query.get('char', [''])[0].lower())
+
+        if path.startswith('/fighter-details/'):
+            fighter_id = path.rsplit('/', 1)[-1]
+            if fighter_id in self.fighters:
+                return self.fighters[fighter_id]
+            digest = hashlib.sha256(fighter_id.encode()).digest()
+            return self.fallback[int.from_bytes(digest[:4], 'big') % len(self.fallback)]
+
+        return None
+
+    def should_throttle(self):
+        with self.lock:
+            self.requests += 1
+            throttle = self.throttle_every and self.requests % self.throttle_every == 0
+            if throttle:
+                self.throttled += 1
+            return throttle
+
+    def start(self):
+        """Start serving and return the base URL to point the scraper at"""
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                if stub.latency:
+                    time.sleep(stub.latency)
+
+                if stub.should_throttle():
+                    self.send_response(429)
+                    self.send_header('Retry-After', str(stub.retry_after))
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                url = urllib.parse.urlparse(self.path)
+                body = stub.page(url.path, urllib.parse.parse_qs(url.query))
+                if body is None:
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', self.port), Handler)
+        self.server.daemon_threads = True
+        base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.load(base_url)
+
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return base_url
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the recorded ufcstats corpus locally")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument('--throttle-every', type=int, default=0, help="answer every Nth request with a 429")
+    parser.add_argument('--retry-after', type=int, default=1, help="Retry-After seconds sent with a 429")
+    args = parser.parse_args()
+
+    stub = StubServer(latency=args.latency, throttle_every=args.throttle_every,
+                      retry_after=args.retry_after, port=args.port)
+    print(f"Serving {FIXTURES_DIR} at {stub.start()} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
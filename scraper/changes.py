@@ -0,0 +1,83 @@
+import json
+import os
+from datetime import datetime, timezone
+
+CHANGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'exports', 'changes')
+
+# Fields left out of the field-level diff: scraped_at moves on every refetch, and
+# stats is derived from the display fields, which are reported themselves
+VOLATILE_FIELDS = {'scraped_at', 'stats'}
+
+
+def flatten(hashes):
+    """{id: hash} from the per-shard {shard: {id: hash}} layout of hashes.json"""
+    return {key: digest for shard in hashes.values() for key, digest in shard.items()}
+
+
+def changed_shards(previous_hashes, hashes):
+    """Shards whose set of (id, hash) pairs differs between two runs"""
+    return sorted(shard for shard in set(previous_hashes) | set(hashes)
+                  if previous_hashes.get(shard) != hashes.get(shard))
+
+
+def field_changes(old, new):
+    """{field: [old, new]} for every non-volatile field that differs between two records"""
+    return {
+        field: [old.get(field), new.get(field)]
+        for field in list(old) + [f for f in new if f not in old]
+        if field not in VOLATILE_FIELDS and old.get(field) != new.get(field)
+    }
+
+
+def build_changeset(previous_hashes, hashes, old_records, new_records):
+    """Compact change set between two runs
+
+    Content hashes decide which fighters changed, so records with equal hashes are never
+    compared field by field; old_records/new_records ({id: fighter}) only need to hold
+    the fighters whose hashes differ. A fighter whose hash moved but whose fields didn't
+    (only scraped_at changed) counts as refreshed, not modified.
+    """
+    previous = flatten(previous_hashes)
+    current = flatten(hashes)
+
+    modified = {}
+    refreshed = 0
+    for key, digest in current.items():
+        if key not in previous or previous[key] == digest:
+            continue
+        fields = field_changes(old_records.get(key, {}), new_records[key])
+        if fields:
+            modified[key] = fields
+        else:
+            refreshed += 1
+
+    return {
+        'generated_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'added': [key for key in current if key not in previous],
+        'removed': [key for key in previous if key not in current],
+        'modified': modified,
+        'refreshed': refreshed,
+        'shards': changed_shards(previous_hashes, hashes),
+    }
+
+
+def is_empty(changeset):
+    return not (changeset['added'] or changeset['removed'] or changeset['modified'])
+
+
+def write_report(changeset, directory=CHANGES_DIR):
+    """Save the change set as <timestamp>.json and latest.json; returns the timestamped path"""
+    os.makedirs(directory, exist_ok=True)
+    stamp = changeset['generated_at'].replace(':', '').replace('+0000', 'Z')
+    data = json.dumps(changeset, indent=2, ensure_ascii=False)
+
+    path = os.path.join(directory, f"{stamp}.json")
+    for target in (path, os.path.join(directory, 'latest.json')):
+        with open(target, 'w', encoding='utf-8') as f:
+            f.write(data)
+    return path
+
+
+def summary(changeset):
+    return (f"{len(changeset['added'])} added, {len(changeset['removed'])} removed, "
+            f"{len(changeset['modified'])} modified, {changeset['refreshed']} refreshed unchanged")
@@ -0,0 +1,139 @@
+import argparse
+import json
+import os
+import shutil
+from datetime import date
+
+import numpy as np
+
+from normalize import numeric_stats
+from publish import DATA_PATH, fighter_key, load_fighters
+
+COLUMNS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'exports', 'career')
+
+# Float columns (NaN when unknown) taken straight from the typed 'stats' record
+STAT_COLUMNS = [
+    'sig_strikes_landed_per_min',
+    'sig_strikes_absorbed_per_min',
+    'striking_accuracy',
+    'striking_defense',
+    'takedown_avg',
+    'takedown_accuracy',
+    'takedown_defense',
+    'submission_avg',
+    'height_in',
+    'reach_in',
+    'weight_lbs',
+]
+FLOAT_COLUMNS = STAT_COLUMNS + ['age']
+INT_COLUMNS = ['wins', 'losses', 'draws']
+
+
+def age_on(dob, today):
+    """Whole years between an ISO date of birth and today, None when unknown"""
+    if not dob:
+        return None
+    born = date.fromisoformat(dob)
+    return today.year - born.year - ((today.month, today.day) < (born.month, born.day))
+
+
+def build_columns(fighters, today=None):
+    """Career stats as {column: ndarray}, one row per named fighter, plus the matching (id, name) rows"""
+    today = today or date.today()
+    fighters = [fighter for fighter in fighters if fighter.get('name')]
+
+    columns = {name: np.full(len(fighters), np.nan, dtype=np.float64) for name in FLOAT_COLUMNS}
+    columns.update({name: np.zeros(len(fighters), dtype=np.int32) for name in INT_COLUMNS})
+    ids = []
+
+    for row, fighter in enumerate(fighters):
+        stats = fighter.get('stats') or numeric_stats(fighter)
+        for name in STAT_COLUMNS:
+            if stats.get(name) is not None:
+                columns[name][row] = stats[name]
+        age = age_on(stats.get('dob'), today)
+        if age is not None:
+            columns['age'][row] = age
+        for name in INT_COLUMNS:
+            columns[name][row] = fighter.get(name) or 0
+        ids.append([fighter_key(fighter), fighter['name']])
+
+    return columns, ids
+
+
+def export_columns(fighters, directory=COLUMNS_DIR):
+    """Write one .npy per column plus ids.json and meta.json, replacing the previous export
+
+    Plain .npy files (rather than .npz) are what np.load can memory-map.
+    """
+    columns, ids = build_columns(fighters)
+
+    staging = f"{directory}.tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    for name, values in columns.items():
+        np.save(os.path.join(staging, f"{name}.npy"), values)
+    with open(os.path.join(staging, 'ids.json'), 'w', encoding='utf-8') as f:
+        json.dump(ids, f, ensure_ascii=False)
+    with open(os.path.join(staging, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump({
+            'count': len(ids),
+            'columns': {name: str(values.dtype) for name, values in columns.items()},
+            'exported_on': date.today().isoformat(),
+        }, f, indent=2)
+
+    # Directories can't be swapped atomically; move the old one aside for the shortest possible gap
+    previous = f"{directory}.old"
+    shutil.rmtree(previous, ignore_errors=True)
+    if os.path.exists(directory):
+        os.replace(directory, previous)
+    os.replace(staging, directory)
+    shutil.rmtree(previous, ignore_errors=True)
+    return len(ids)
+
+
+class CareerColumns:
+    """Memory-mapped career stat columns, each an ndarray row-aligned with ids and names"""
+
+    def __init__(self, directory=COLUMNS_DIR):
+        with open(os.path.join(directory, 'meta.json'), 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+        with open(os.path.join(directory, 'ids.json'), 'r', encoding='utf-8') as f:
+            rows = json.load(f)
+
+        self.ids = [fighter_id for fighter_id, _ in rows]
+        self.names = [name for _, name in rows]
+        self.row_of = {fighter_id: row for row, fighter_id in enumerate(self.ids)}
+        self.columns = {
+            name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r')
+            for name in self.meta['columns']
+        }
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    def row(self, fighter_id):
+        """All columns for one fighter as a dict"""
+        index = self.row_of[fighter_id]
+        return {name: values[index].item() for name, values in self.columns.items()}
+
+
+def load_columns(directory=COLUMNS_DIR):
+    return CareerColumns(directory)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export career stats as memory-mappable NumPy columns")
+    parser.add_argument('--source', default=DATA_PATH, help="fighter records, JSON array or NDJSON")
+    parser.add_argument('--out', default=COLUMNS_DIR)
+    args = parser.parse_args()
+
+    count = export_columns(load_fighters(args.source), args.out)
+    print(f"Exported {count} fighters x {len(FLOAT_COLUMNS) + len(INT_COLUMNS)} columns to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta, timezone
+
+from fighter_index import normalize_name
+
+RECORD_FIELDS = ('wins', 'losses', 'draws')
+
+
+def is_stale(record, max_age_days, now=None):
+    """True if the record was scraped more than max_age_days ago, or has no scrape time at all"""
+    scraped_at = record.get('scraped_at')
+    if not scraped_at:
+        return True
+
+    try:
+        scraped = datetime.fromisoformat(scraped_at)
+    except ValueError:
+        return True
+
+    now = now or datetime.now(timezone.utc)
+    return now - scraped > timedelta(days=max_age_days)
+
+
+def refresh_reason(record, entry, max_age_days=30, now=None):
+    """Why a stored record needs its detail page refetched, or None if the listing row says it's current"""
+    if record is None:
+        return 'new'
+
+    if any(record.get(key) != entry.get(key) for key in RECORD_FIELDS):
+        return 'record changed'
+
+    if max_age_days is not None and is_stale(record, max_age_days, now):
+        return 'stale'
+
+    return None
+
+
+def match_existing(existing):
+    """Index stored records by ufcstats id and by normalized name"""
+    by_id = {}
+    by_name = {}
+    for record in existing:
+        if record.get('ufcstats_id'):
+            by_id[record['ufcstats_id']] = record
+        if record.get('name'):
+            by_name.setdefault(normalize_name(record['name']), record)
+    return by_id, by_name
+
+
+def plan_refresh(listing, existing, max_age_days=30, now=None):
+    """Split listing rows into (entry, reason) pairs to refetch and (entry, record) pairs to keep as stored"""
+    by_id, by_name = match_existing(existing)
+    to_fetch = []
+    unchanged = []
+
+    for entry in listing:
+        record = by_id.get(entry['id']) or by_name.get(normalize_name(entry['name']))
+        reason = refresh_reason(record, entry, max_age_days, now)
+        if reason:
+            to_fetch.append((entry, reason))
+        else:
+            unchanged.append((entry, record))
+
+    return to_fetch, unchanged
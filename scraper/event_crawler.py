@@ -0,0 +1,151 @@
+import argparse
+import asyncio
+import functools
+from datetime import date
+
+import aiohttp
+
+from async_scraper import AsyncCrawler
+from events import EVENTS_URL, parse_event, parse_events_listing, parse_fight_details
+from fetcher import DEFAULT_HEADERS
+from fight_store import FIGHTS_DB_PATH, FightStore, refresh_fighters
+
+
+def new_events(listing, complete, today=None, backfill=False, incomplete=()):
+    """Held events from the newest-first listing that aren't complete yet, oldest first
+
+    Stops at the first complete event unless an incomplete one (stored by a run that
+    was interrupted or failed) is listed further down, so those are always retried;
+    backfill fills every gap. The upcoming event heading the listing (dated after
+    today) is skipped.
+    """
+    today = (today or date.today()).isoformat()
+    retry = {event['id'] for event in listing} & set(incomplete)
+    events = []
+    for event in listing:
+        if not event['date'] or event['date'] > today:
+            continue
+        if event['id'] in complete:
+            if backfill or retry:
+                continue
+            break
+        retry.discard(event['id'])
+        events.append(event)
+    return events[::-1]
+
+
+class EventPipeline:
+    """Completed-events listing -> event pages -> fight-details pages, with bounded queues between the stages
+
+    Events are processed oldest first and only marked complete once every fight on the
+    card has its details and a result, so an interrupted run leaves no gap: the next
+    one picks up the unfinished events again. Event pages are always revalidated, since
+    upcoming_card.py caches the same pages before fight night.
+    """
+
+    def __init__(self, store, crawler=None, events_url=EVENTS_URL, event_workers=2):
+        self.store = store
+        self.crawler = crawler or AsyncCrawler(concurrency=4)
+        self.events_url = events_url
+        self.event_workers = event_workers
+        self.competed = {}
+
+    async def run(self, limit=None, backfill=False, details=True):
+        """Crawl the new events; returns how many were stored"""
+        crawler = self.crawler
+        crawler.semaphore = asyncio.Semaphore(crawler.concurrency)
+        async with aiohttp.ClientSession(headers=DEFAULT_HEADERS, timeout=crawler.timeout) as session:
+            crawler.session = session
+            listing = await crawler.parse(parse_events_listing, await crawler.fetch(self.events_url, max_age=0))
+            complete = self.store.event_ids()
+            incomplete = self.store.event_ids(complete=False) - complete
+            events = new_events(listing, complete, backfill=backfill, incomplete=incomplete)[:limit]
+            print(f"📅 {len(listing)} events listed, {len(events)} to crawl")
+
+            event_queue = asyncio.Queue(maxsize=self.event_workers)
+            fight_queue = asyncio.Queue(maxsize=crawler.concurrency * 4)
+            remaining = {}
+
+            async def event_worker():
+                while True:
+                    event = await event_queue.get()
+                    try:
+                        # upcoming_card caches the same page before fight night, without results
+                        html = await crawler.fetch(event['url'], max_age=0)
+                        fights = await crawler.parse(functools.partial(parse_event, event=event), html)
+                        self.store.add_event(event, fights)
+                        for fight in fights:
+                            self.competed[fight.fighter1_id] = fight.fighter1
+                            self.competed[fight.fighter2_id] = fight.fighter2
+
+                        todo = [fight for fight in fights if details and not self.store.has_details(fight.fight_id)]
+                        remaining[event['id']] = len(todo)
+                        if not todo:
+                            self.finish(event)
+                        for fight in todo:
+                            await fight_queue.put((event, fight))
+                    except Exception as e:
+                        print(f"❌ {event['name']}: {e}")
+                    finally:
+                        event_queue.task_done()
+
+            async def fight_worker():
+                while True:
+                    event, fight = await fight_queue.get()
+                    try:
+                        html = await crawler.fetch(fight.url)
+                        self.store.add_fight_details(fight.fight_id, await crawler.parse(parse_fight_details, html))
+                        remaining[event['id']] -= 1
+                        if remaining[event['id']] == 0:
+                            self.finish(event)
+                    except Exception as e:
+                        print(f"❌ {fight.fighter1} vs {fight.fighter2} ({event['name']}): {e}")
+                    finally:
+                        fight_queue.task_done()
+
+            workers = [asyncio.create_task(event_worker()) for _ in range(self.event_workers)]
+            workers += [asyncio.create_task(fight_worker()) for _ in range(crawler.concurrency)]
+            for event in events:
+                await event_queue.put(event)
+            await event_queue.join()
+            await fight_queue.join()
+
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        crawler.session = None
+        return len(events)
+
+    def finish(self, event):
+        if self.store.complete_event(event['id']):
+            print(f"✅ {event['date']} {event['name']}")
+        else:
+            print(f"⏳ {event['date']} {event['name']}: some fights have no result yet, will retry next run")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawl new ufcstats events, their fights and per-round stats")
+    parser.add_argument('--db', default=FIGHTS_DB_PATH)
+    parser.add_argument('--limit', type=int, help="crawl at most this many events (oldest new ones first)")
+    parser.add_argument('--backfill', action='store_true',
+                        help="crawl every event not stored yet, not just those newer than the last one seen")
+    parser.add_argument('--no-details', action='store_true', help="skip the fight-details pages (no per-round stats)")
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--refresh-fighters', action='store_true',
+                        help="then refetch everyone who fought on the new events and publish their records")
+    args = parser.parse_args()
+
+    with FightStore(args.db) as store:
+        pipeline = EventPipeline(store, AsyncCrawler(concurrency=args.concurrency))
+        crawled = asyncio.run(pipeline.run(limit=args.limit, backfill=args.backfill, details=not args.no_details))
+        print(f"\nCrawled {crawled} events; {len(pipeline.competed)} fighters competed on them")
+
+        if args.refresh_fighters and pipeline.competed:
+            print(f"\n🔄 Refreshing {len(pipeline.competed)} fighters...")
+            refreshed = refresh_fighters(store, pipeline.competed, max_age=0)
+            print(f"Refreshed {len(refreshed)} fighters")
+
+
+if __name__ == "__main__":
+    main()
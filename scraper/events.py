@@ -0,0 +1,234 @@
+import re
+
+from extractor import COL_FIGHTERS, COL_METHOD, COL_RESULT, COL_ROUND, COL_TIME
+from extractor import cell_lines, fighter_id_from_url, fighter_link, normalize_method
+from normalize import parse_date
+from parsing import EVENT_PAGE, EVENTS_PAGE, make_soup
+from records import Fight
+
+EVENTS_URL = "http://ufcstats.com/statistics/events/completed?page=all"
+UPCOMING_URL = "http://ufcstats.com/statistics/events/upcoming?page=all"
+
+# Event pages share the fighter page's result/fighters/method/round/time columns; 6 is the weight class
+COL_WEIGHT_CLASS = 6
+
+# Columns of the two fight-details stat tables (totals and significant strikes), after 'Fighter'
+TOTALS_COLUMNS = ['kd', 'sig_str', 'sig_str_pct', 'total_str', 'td', 'td_pct', 'sub_att', 'rev', 'ctrl']
+STRIKES_COLUMNS = ['sig_str', 'sig_str_pct', 'head', 'body', 'leg', 'distance', 'clinch', 'ground']
+
+# "X of Y" columns, stored as <name>_landed / <name>_attempted
+ATTEMPT_COLUMNS = ['sig_str', 'total_str', 'td', 'head', 'body', 'leg', 'distance', 'clinch', 'ground']
+
+# Every stat kept per fighter and round (round 0 = whole fight); percentages are derivable
+STAT_FIELDS = ['kd', 'sub_att', 'rev', 'ctrl_seconds'] + [
+    f"{name}_{part}" for name in ATTEMPT_COLUMNS for part in ('landed', 'attempted')
+]
+
+ATTEMPTS_RE = re.compile(r'(\d+)\s+of\s+(\d+)')
+ROUND_RE = re.compile(r'Round\s+(\d+)')
+SCHEDULED_RE = re.compile(r'(\d+)\s+Rnd')
+
+# Fight-details person status -> our result vocabulary
+STATUSES = {'W': 'win', 'L': 'loss', 'D': 'draw', 'NC': 'nc'}
+
+
+def parse_events_listing(html):
+    """Every event row of a completed or upcoming events listing, newest first: id, url, name, ISO date, location"""
+    soup = make_soup(html, EVENTS_PAGE)
+    events = []
+
+    for row in soup.find_all('tr', class_='b-statistics__table-row'):
+        link = row.find('a', href=True)
+        date_tag = row.find('span', class_='b-statistics__date')
+        if not link or not date_tag:
+            continue
+
+        cols = row.find_all('td')
+        events.append({
+            'id': fighter_id_from_url(link['href']),
+            'url': link['href'],
+            'name': ' '.join(link.get_text().split()),
+            'date': parse_date(date_tag.get_text(strip=True)),
+            'location': cols[1].get_text(strip=True) if len(cols) > 1 else None,
+        })
+
+    return events
+
+
+def fight_rows(soup):
+    """(fight url, cells, (fighter1 id, name), (fighter2 id, name)) for each bout row of an event page"""
+    for row in soup.find_all('tr', class_='b-fight-details__table-row'):
+        url = row.get('data-link')
+        cols = row.find_all('td', recursive=False)
+        if not url or len(cols) <= COL_TIME:
+            continue
+
+        links = cols[COL_FIGHTERS].find_all('a')
+        if len(links) < 2:
+            continue
+        yield url, cols, fighter_link(links[0]), fighter_link(links[1])
+
+
+def parse_event(html, event):
+    """Fights on an event page as Fight records, in card order (main event first)
+
+    The winner is listed first and carries the only 'win' flag; draws and no contests
+    flag both fighters.
+    """
+    soup = make_soup(html, EVENT_PAGE)
+    fights = []
+
+    for url, cols, (fighter1_id, fighter1), (fighter2_id, fighter2) in fight_rows(soup):
+        flag = cols[COL_RESULT].get_text(' ', strip=True).lower().split()
+        outcome = flag[0] if flag else None
+        method_lines = cell_lines(cols[COL_METHOD])
+        fights.append(Fight(
+            fight_id=fighter_id_from_url(url),
+            url=url,
+            event=event['name'],
+            event_id=event['id'],
+            date=event['date'],
+            fighter1_id=fighter1_id,
+            fighter1=fighter1,
+            fighter2_id=fighter2_id,
+            fighter2=fighter2,
+            outcome=outcome,
+            winner=1 if outcome == 'win' else None,
+            method=normalize_method(method_lines[0]) if method_lines[0] else None,
+            method_detail=method_lines[1] if len(method_lines) > 1 else None,
+            round=cols[COL_ROUND].get_text(strip=True) or None,
+            time=cols[COL_TIME].get_text(strip=True) or None,
+        ))
+
+    return fights
+
+
+def parse_card(html):
+    """Booked bouts on an upcoming event page, in card order (main event first)
+
+    Upcoming fights have no time format yet, so scheduled rounds follow the UFC rule:
+    five for the main event and for title fights (the belt icon in the weight class
+    cell), three otherwise.
+    """
+    soup = make_soup(html, EVENT_PAGE)
+    bouts = []
+
+    for url, cols, (fighter1_id, fighter1), (fighter2_id, fighter2) in fight_rows(soup):
+        weight_cell = cols[COL_WEIGHT_CLASS]
+        title = any('belt' in img.get('src', '') for img in weight_cell.find_all('img'))
+        main_event = not bouts
+        bouts.append({
+            'fight_id': fighter_id_from_url(url),
+            'url': url,
+            'weight_class': ' '.join(weight_cell.get_text().split()) or None,
+            'title': title,
+            'main_event': main_event,
+            'scheduled_rounds': 5 if main_event or title else 3,
+            'fighter1': {'id': fighter1_id, 'name': fighter1},
+            'fighter2': {'id': fighter2_id, 'name': fighter2},
+        })
+
+    return bouts
+
+
+def parse_control(text):
+    """Control time 'M:SS' in seconds, None for '--'"""
+    minutes, _, seconds = text.partition(':')
+    if not (minutes.isdigit() and seconds.isdigit()):
+        return None
+    return int(minutes) * 60 + int(seconds)
+
+
+def parse_stat_cell(name, text, stats):
+    """Store one stat cell's value for one fighter into stats"""
+    if name.endswith('_pct'):
+        return
+    if name == 'ctrl':
+        stats['ctrl_seconds'] = parse_control(text)
+    elif name in ATTEMPT_COLUMNS:
+        match = ATTEMPTS_RE.search(text)
+        stats[f"{name}_landed"] = int(match.group(1)) if match else None
+        stats[f"{name}_attempted"] = int(match.group(2)) if match else None
+    else:
+        stats[name] = int(text) if text.isdigit() else None
+
+
+def parse_stat_table(table, stats):
+    """Fold one totals or significant-strikes table into stats[(side, round)]
+
+    Side is 0/1 for the first/second fighter. Per-round tables carry 'Round N' header
+    rows before each round's data row; the whole-fight tables count as round 0.
+    """
+    headers = [th.get_text(strip=True) for th in table.find_all('th')]
+    if not headers or headers[0] != 'Fighter':
+        return
+    columns = STRIKES_COLUMNS if 'Head' in headers else TOTALS_COLUMNS
+    current_round = 0
+
+    for row in table.find_all('tr'):
+        heading = ROUND_RE.search(row.get_text(' ', strip=True)) if row.find('th') else None
+        if heading:
+            current_round = int(heading.group(1))
+            continue
+
+        cols = row.find_all('td', recursive=False)
+        if len(cols) < 2:
+            continue
+        for name, col in zip(columns, cols[1:]):
+            values = [p.get_text(strip=True) for p in col.find_all('p')]
+            for side, text in enumerate(values[:2]):
+                parse_stat_cell(name, text, stats.setdefault((side, current_round), {}))
+
+
+def parse_fight_details(html):
+    """Everything a fight-details page adds to the event row
+
+    Returns the two fighters (id, name, result), weight class, scheduled rounds, time
+    format, referee, and stat rows (one per fighter and round, round 0 = whole fight)
+    with the STAT_FIELDS counts.
+    """
+    soup = make_soup(html)
+
+    fighters = []
+    for person in soup.find_all('div', class_='b-fight-details__person'):
+        link = person.find('a', class_='b-fight-details__person-link') or person.find('a', href=True)
+        status = person.find('i', class_='b-fight-details__person-status')
+        if not link:
+            continue
+        fighter_id, name = fighter_link(link)
+        fighters.append({
+            'id': fighter_id,
+            'name': name,
+            'result': STATUSES.get(status.get_text(strip=True)) if status else None,
+        })
+
+    title = soup.find('i', class_='b-fight-details__fight-title')
+    details = {
+        'fighters': fighters,
+        'weight_class': ' '.join(title.get_text().split()) if title else None,
+        'time_format': None,
+        'scheduled_rounds': None,
+        'referee': None,
+    }
+
+    # "Method: KO/TKO  Round: 1  Time: 2:31  Time format: 3 Rnd (5-5-5)  Referee: Herb Dean"
+    for item in soup.select('p.b-fight-details__text i.b-fight-details__text-item, '
+                            'p.b-fight-details__text i.b-fight-details__text-item_first'):
+        label, _, value = ' '.join(item.get_text().split()).partition(':')
+        if label == 'Time format':
+            details['time_format'] = value.strip()
+            scheduled = SCHEDULED_RE.search(value)
+            details['scheduled_rounds'] = int(scheduled.group(1)) if scheduled else None
+        elif label == 'Referee':
+            details['referee'] = value.strip() or None
+
+    stats = {}
+    for table in soup.find_all('table'):
+        parse_stat_table(table, stats)
+
+    details['stats'] = [
+        dict({'side': side, 'fighter_id': fighters[side]['id'] if side < len(fighters) else None, 'round': rnd},
+             **{key: values.get(key) for key in STAT_FIELDS})
+        for (side, rnd), values in sorted(stats.items(), key=lambda item: (item[0][1], item[0][0]))
+    ]
+    return details
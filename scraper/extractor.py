@@ -0,0 +1,229 @@
+import re
+from datetime import datetime, timezone
+
+from fetcher import get_fetcher
+from normalize import parse_date
+from parsing import FIGHTER_PAGE, make_soup
+from records import Fight, Fighter
+
+# Label text (before the colon) of each b-list__box-list-item -> record field
+FIELD_LABELS = {
+    'Height': 'height',
+    'Weight': 'weight',
+    'Reach': 'reach',
+    'STANCE': 'stance',
+    'DOB': 'dob',
+    'SLpM': 'sig_strikes_landed_per_min',
+    'Str. Acc.': 'striking_accuracy',
+    'SApM': 'sig_strikes_absorbed_per_min',
+    'Str. Def': 'striking_defense',
+    'TD Avg.': 'takedown_avg',
+    'TD Acc.': 'takedown_accuracy',
+    'TD Def.': 'takedown_defense',
+    'Sub. Avg.': 'submission_avg',
+}
+
+RECORD_RE = re.compile(r'Record:\s*(\d+)-(\d+)-(\d+)')
+
+# Columns of a fight history row on a fighter page
+COL_RESULT, COL_FIGHTERS, COL_EVENT, COL_METHOD, COL_ROUND, COL_TIME = 0, 1, 6, 7, 8, 9
+
+RESULTS = {'win', 'loss', 'draw', 'nc'}
+
+
+def fighter_id_from_url(url):
+    """ufcstats fighter id, the last path segment of a fighter-details URL"""
+    return url.rstrip('/').rsplit('/', 1)[-1]
+
+
+def utc_now():
+    """Current UTC time as the ISO string stored in scraped_at"""
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+
+
+def calculate_age(dob_string):
+    """Calculate age from DOB string like 'Jan 22, 1993'"""
+    if not dob_string or dob_string == "--":
+        return None
+
+    try:
+        dob = datetime.strptime(dob_string, "%b %d, %Y")
+    except ValueError:
+        return None
+
+    today = datetime.now()
+    return today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
+
+
+def normalize_method(method):
+    """Collapse ufcstats method codes into the labels the app displays"""
+    if 'KO/TKO' in method:
+        return 'KO/TKO'
+    if 'SUB' in method:
+        return 'Submission'
+    if 'U-DEC' in method:
+        return 'Decision (Unanimous)'
+    if 'S-DEC' in method:
+        return 'Decision (Split)'
+    if 'DEC' in method:
+        return 'Decision'
+    return method
+
+
+def completed_rows(soup, min_cols=COL_ROUND + 1):
+    """(row, cols, result) for every finished bout in the history table, newest first"""
+    table = soup.find('table', class_='b-fight-details__table')
+    if not table:
+        return
+
+    for row in table.find_all('tr', class_='b-fight-details__table-row'):
+        cols = row.find_all('td', recursive=False)
+        if len(cols) < min_cols:
+            continue
+
+        # Skips the header and upcoming bouts, whose result column reads 'next'
+        result = cols[COL_RESULT].get_text(strip=True).lower()
+        if result in RESULTS:
+            yield row, cols, result
+
+
+def cell_lines(col):
+    """The text lines of a history cell, e.g. ['KO/TKO', 'Punches'] or ['UFC 300', 'Apr. 13, 2024']"""
+    return col.get_text('\n', strip=True).split('\n')
+
+
+def fighter_link(link):
+    """(id, name) of a link in the fighters column"""
+    return fighter_id_from_url(link['href']) if link.get('href') else None, ' '.join(link.get_text().split())
+
+
+def parse_fight_row(row, cols, result):
+    """Fight from one history row, or None when the row doesn't name both fighters
+
+    The page's own fighter is always listed first in the fighters column and the result
+    is theirs, so the row says who won without comparing any names.
+    """
+    links = cols[COL_FIGHTERS].find_all('a')
+    if len(links) < 2:
+        return None
+    (fighter1_id, fighter1), (fighter2_id, fighter2) = fighter_link(links[0]), fighter_link(links[1])
+
+    result_link = cols[COL_RESULT].find('a', href=True)
+    url = row.get('data-link') or (result_link['href'] if result_link else None)
+    event_link = cols[COL_EVENT].find('a', href=True)
+    event_lines = cell_lines(cols[COL_EVENT])
+    method_lines = cell_lines(cols[COL_METHOD])
+    return Fight(
+        fight_id=fighter_id_from_url(url) if url else None,
+        url=url,
+        event=event_lines[0] or None,
+        event_id=fighter_id_from_url(event_link['href']) if event_link else None,
+        date=parse_date(event_lines[-1]) if len(event_lines) > 1 else None,
+        fighter1_id=fighter1_id,
+        fighter1=fighter1,
+        fighter2_id=fighter2_id,
+        fighter2=fighter2,
+        outcome='win' if result in ('win', 'loss') else result,
+        winner={'win': 1, 'loss': 2}.get(result),
+        method=normalize_method(method_lines[0]) if method_lines[0] else None,
+        method_detail=method_lines[1] if len(method_lines) > 1 else None,
+        round=cols[COL_ROUND].get_text(strip=True) or None,
+        time=(cols[COL_TIME].get_text(strip=True) or None) if len(cols) > COL_TIME else None,
+    )
+
+
+def extract_fights(soup, known=()):
+    """(fight id, Fight) for every completed bout in the history table, newest first
+
+    Rows whose fight-details id is in known (already stored from the opponent's page)
+    aren't parsed any further and come back as (fight id, None).
+    """
+    for row, cols, result in completed_rows(soup):
+        url = row.get('data-link')
+        if url and fighter_id_from_url(url) in known:
+            yield fighter_id_from_url(url), None
+            continue
+
+        fight = parse_fight_row(row, cols, result)
+        if fight and fight.fight_id:
+            yield fight.fight_id, fight
+
+
+def extract_fight_history(soup, limit=3):
+    """Most recent completed fights from the history table as FightResult records, newest first"""
+    fights = []
+    for row, cols, result in completed_rows(soup):
+        fight = parse_fight_row(row, cols, result)
+        if not fight:
+            continue
+
+        fights.append(fight.bout_for().to_result())
+        if limit and len(fights) >= limit:
+            break
+
+    return fights
+
+
+def parse_fighter(soup, url=None):
+    """Fighter record from a parsed page, everything but the fight history"""
+    details = Fighter()
+    if url:
+        details.ufcstats_id = fighter_id_from_url(url)
+        details.scraped_at = utc_now()
+
+    name_tag = soup.find('span', class_='b-content__title-highlight')
+    if name_tag:
+        details.name = name_tag.get_text(strip=True)
+
+    nickname_tag = soup.find('p', class_='b-content__Nickname')
+    if nickname_tag:
+        details.nickname = nickname_tag.get_text(strip=True).replace('Nickname:', '').strip()
+
+    record_tag = soup.find('span', class_='b-content__title-record')
+    if record_tag:
+        record_match = RECORD_RE.search(record_tag.get_text())
+        if record_match:
+            details.wins = int(record_match.group(1))
+            details.losses = int(record_match.group(2))
+            details.draws = int(record_match.group(3))
+
+    # Bio details and career stats share the same list item markup: "Label: value"
+    for item in soup.find_all('li', class_='b-list__box-list-item'):
+        label, _, value = item.get_text().partition(':')
+        key = FIELD_LABELS.get(label.strip())
+        if key:
+            setattr(details, key, value.strip())
+
+    details.age = calculate_age(details.dob)
+    details.parse_stats()
+    return details
+
+
+def extract_fighter(html, fast=True, url=None):
+    """Parse a fighter-details page into a Fighter record in one pass over its list items
+
+    Pass the page URL to stamp the record with its ufcstats id and scrape time.
+    """
+    soup = make_soup(html, FIGHTER_PAGE, fast=fast)
+    details = parse_fighter(soup, url)
+    details.last_3_fights = extract_fight_history(soup)
+    return details
+
+
+def extract_fighter_history(html, url, known=(), fast=True):
+    """(Fighter, [(fight id, Fight)]) from a fighter-details page: the record plus its full history
+
+    Fights whose id is in known come back as None (see extract_fights); last_3_fights is
+    left empty, since the fights store derives it.
+    """
+    soup = make_soup(html, FIGHTER_PAGE, fast=fast)
+    return parse_fighter(soup, url), list(extract_fights(soup, known))
+
+
+def fetch_fighter(url, fetcher=None, max_age=None):
+    """Fetch and extract a fighter-details page through the shared fetcher
+
+    Refresh jobs pass max_age=0 so a page cached before the fighter's last bout is revalidated.
+    """
+    fetcher = fetcher or get_fetcher()
+    return extract_fighter(fetcher.get(url, max_age).content, url=url)
@@ -0,0 +1,146 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+from http_cache import HTTPCache
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+}
+
+
+class RateLimiter:
+    """Spread requests evenly so all threads together stay under a requests-per-second cap"""
+
+    def __init__(self, requests_per_second):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        """Block until the caller is allowed to send its next request"""
+        if not self.interval:
+            return
+
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class Fetcher:
+    """Pooled keep-alive HTTP session with parallel fetches under a global rate cap
+
+    With a cache, fresh entries are served from disk without touching the network and
+    stale ones are revalidated with a conditional GET, so unchanged pages cost a 304.
+    """
+
+    def __init__(self, max_workers=8, requests_per_second=4, timeout=30, retries=3, headers=None, cache=None):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.cache = cache
+        self.limiter = RateLimiter(requests_per_second)
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=1,
+            status_forcelist=[429, 500, 502, 503, 504],
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_workers, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.headers.update(headers or DEFAULT_HEADERS)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def get(self, url, max_age=None):
+        """Fetch a URL through the cache and shared session, waiting for a rate-limit slot first
+
+        max_age overrides the cache TTL for this request; pass 0 to always revalidate.
+        """
+        entry = self.cache.get(url) if self.cache else None
+        if entry and self.cache.is_fresh(entry, max_age):
+            return _cached_response(url, entry)
+
+        self.limiter.wait()
+        headers = self.cache.validators(entry) if entry else None
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+
+        if response.status_code == 304 and entry:
+            self.cache.touch(url)
+            return _cached_response(url, entry)
+
+        response.raise_for_status()
+        if self.cache:
+            self.cache.store(url, response.content, response.headers)
+        return response
+
+    def get_soup(self, url):
+        """Fetch a URL and parse it with BeautifulSoup"""
+        response = self.get(url)
+        return BeautifulSoup(response.content, 'html.parser')
+
+    def map(self, func, items, window=None):
+        """Run func(item) on a thread pool, yielding (item, result, error) as each finishes
+
+        items is consumed lazily and at most window (default twice the pool size) calls
+        are in flight or waiting to be yielded, so memory stays flat however many items
+        a crawl covers.
+        """
+        window = window or self.max_workers * 2
+        items = iter(items)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {}
+            while True:
+                for item in items:
+                    futures[pool.submit(func, item)] = item
+                    if len(futures) >= window:
+                        break
+                if not futures:
+                    return
+
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = futures.pop(future)
+                    try:
+                        yield item, future.result(), None
+                    except Exception as e:
+                        yield item, None, e
+
+    def close(self):
+        self.session.close()
+
+
+def _cached_response(url, entry):
+    """Wrap a cache entry in a requests.Response so callers can't tell it apart from a live fetch"""
+    response = requests.Response()
+    response.url = url
+    response.status_code = 200
+    response._content = entry['body']
+    response.headers = CaseInsensitiveDict({'Content-Type': entry.get('content_type') or 'text/html'})
+    response.encoding = 'utf-8'
+    return response
+
+
+_default_fetcher = None
+_default_lock = threading.Lock()
+
+
+def get_fetcher():
+    """Return the process-wide fetcher shared by every scraper script"""
+    global _default_fetcher
+    with _default_lock:
+        if _default_fetcher is None:
+            _default_fetcher = Fetcher(cache=HTTPCache())
+        return _default_fetcher
@@ -0,0 +1,350 @@
+import argparse
+import os
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+
+from extractor import extract_fighter_history, utc_now
+from fetcher import get_fetcher
+from events import STAT_FIELDS
+from fighter_index import load_index, normalize_name
+from fighter_store import REPLACE, MemoryFighterStore
+from publish import load_fighters, publish
+from records import FIGHT_ROW_FIELDS, Fight
+
+FIGHTS_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fights.db')
+FIGHTER_URL = "http://ufcstats.com/fighter-details/{id}"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS fights (
+    fight_id TEXT PRIMARY KEY,
+    url TEXT,
+    event TEXT,
+    event_id TEXT,
+    date TEXT,
+    fighter1_id TEXT,
+    fighter1 TEXT,
+    fighter2_id TEXT,
+    fighter2 TEXT,
+    outcome TEXT,
+    winner INTEGER,
+    method TEXT,
+    method_detail TEXT,
+    round TEXT,
+    time TEXT
+);
+CREATE INDEX IF NOT EXISTS fights_event ON fights (event_id);
+
+CREATE TABLE IF NOT EXISTS fighter_fights (
+    fighter_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    fight_id TEXT NOT NULL,
+    PRIMARY KEY (fighter_id, position)
+);
+CREATE INDEX IF NOT EXISTS fighter_fights_fight ON fighter_fights (fight_id);
+
+CREATE TABLE IF NOT EXISTS crawled (
+    fighter_id TEXT PRIMARY KEY,
+    name TEXT,
+    name_key TEXT,
+    bouts INTEGER NOT NULL,
+    crawled_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS crawled_name_key ON crawled (name_key);
+
+CREATE TABLE IF NOT EXISTS events (
+    event_id TEXT PRIMARY KEY,
+    name TEXT,
+    date TEXT,
+    location TEXT,
+    fights INTEGER NOT NULL,
+    complete INTEGER NOT NULL DEFAULT 0,
+    crawled_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_date ON events (date);
+
+CREATE TABLE IF NOT EXISTS fight_details (
+    fight_id TEXT PRIMARY KEY,
+    weight_class TEXT,
+    time_format TEXT,
+    scheduled_rounds INTEGER,
+    referee TEXT
+);
+
+CREATE TABLE IF NOT EXISTS fight_stats (
+    fight_id TEXT NOT NULL,
+    side INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    fighter_id TEXT,
+    {stat_columns},
+    PRIMARY KEY (fight_id, side, round)
+);
+CREATE INDEX IF NOT EXISTS fight_stats_fighter ON fight_stats (fighter_id);
+""".format(stat_columns=',\n    '.join(f"{name} INTEGER" for name in STAT_FIELDS))
+
+
+class FightStore:
+    """SQLite store of every bout on every crawled fighter page
+
+    Each bout is one fights row keyed by its fight-details id, stored the first time
+    either fighter's page is crawled; fighter_fights links it to both fighters in the
+    order their pages list it. Kept apart from the fighter store so a full-history crawl
+    can stream rows in one fighter at a time without ever holding the roster's history
+    in memory. The crawled table doubles as the crawl's progress log: a restarted crawl
+    skips fighters already in it.
+    """
+
+    def __init__(self, path=FIGHTS_DB_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    def __len__(self):
+        return self.conn.execute('SELECT COUNT(*) FROM fights').fetchone()[0]
+
+    def fight_ids(self):
+        """Ids of every stored fight, for extract_fights to skip"""
+        return {row['fight_id'] for row in self.conn.execute('SELECT fight_id FROM fights')}
+
+    def replace_history(self, fighter_id, name, fights):
+        """Store one fighter's history, [(fight id, Fight or None if already stored)] newest first"""
+        with self.conn:
+            self.conn.executemany(
+                f'INSERT OR REPLACE INTO fights ({", ".join(FIGHT_ROW_FIELDS)}) '
+                f'VALUES ({", ".join("?" * len(FIGHT_ROW_FIELDS))})',
+                [fight.to_row() for _, fight in fights if fight is not None],
+            )
+            self.conn.execute('DELETE FROM fighter_fights WHERE fighter_id = ?', (fighter_id,))
+            self.conn.executemany(
+                'INSERT INTO fighter_fights (fighter_id, position, fight_id) VALUES (?, ?, ?)',
+                [(fighter_id, position, fight_id) for position, (fight_id, _) in enumerate(fights)],
+            )
+            self.conn.execute(
+                'INSERT OR REPLACE INTO crawled (fighter_id, name, name_key, bouts, crawled_at) VALUES (?, ?, ?, ?, ?)',
+                (fighter_id, name, normalize_name(name), len(fights), utc_now()))
+
+    def crawled_ids(self, since=None):
+        """Ids of the fighters crawled at all, or since the given ISO timestamp"""
+        rows = self.conn.execute('SELECT fighter_id FROM crawled WHERE crawled_at >= ?', (since or '',))
+        return {row['fighter_id'] for row in rows}
+
+    def is_crawled(self, fighter_id=None, name=None):
+        """Whether a fighter's page has been crawled, by ufcstats id or else by name"""
+        column, value = ('fighter_id', fighter_id) if fighter_id else ('name_key', normalize_name(name or ''))
+        return self.conn.execute(f'SELECT 1 FROM crawled WHERE {column} = ? LIMIT 1', (value,)).fetchone() is not None
+
+    def history(self, fighter_id=None, name=None, limit=None):
+        """A fighter's bouts (their side of each Fight) newest first, by ufcstats id or else by name"""
+        if not fighter_id:
+            row = self.conn.execute('SELECT fighter_id FROM crawled WHERE name_key = ? LIMIT 1',
+                                    (normalize_name(name or ''),)).fetchone()
+            if not row:
+                return []
+            fighter_id = row['fighter_id']
+
+        rows = self.conn.execute(
+            'SELECT fights.*, fighter_fights.position FROM fighter_fights JOIN fights USING (fight_id) '
+            'WHERE fighter_fights.fighter_id = ? ORDER BY fighter_fights.position LIMIT ?',
+            (fighter_id, limit or -1))
+        return [Fight.from_row(row).bout_for(fighter_id, row['position']) for row in rows]
+
+    def last_fights(self, fighter, limit=3):
+        """last_3_fights entries for a published record, None when the fighter was never crawled"""
+        fighter_id = fighter.get('ufcstats_id')
+        if not (fighter_id and self.is_crawled(fighter_id=fighter_id)):
+            fighter_id = None
+            if not self.is_crawled(name=fighter.get('name')):
+                return None
+        return [bout.to_result().to_dict() for bout in self.history(fighter_id, fighter.get('name'), limit)]
+
+    def last_fight_dates(self):
+        """{fighter id: date of their latest stored bout} for every crawled fighter"""
+        rows = self.conn.execute('SELECT fighter_fights.fighter_id, MAX(fights.date) AS date FROM fighter_fights '
+                                 'JOIN fights USING (fight_id) GROUP BY fighter_fights.fighter_id')
+        return {row['fighter_id']: row['date'] for row in rows if row['date']}
+
+    def event_ids(self, complete=True):
+        """Ids of the events stored, by default only those whose every fight has its details and outcome"""
+        rows = self.conn.execute('SELECT event_id FROM events WHERE complete >= ?', (1 if complete else 0,))
+        return {row['event_id'] for row in rows}
+
+    def add_event(self, event, fights):
+        """Store an event and the fights on its card
+
+        Fights already stored from a fighter page are kept, unless the stored row has no
+        outcome yet (parsed before fight night), in which case the new row replaces it.
+        """
+        with self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO events (event_id, name, date, location, fights, complete, crawled_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (event['id'], event['name'], event['date'], event.get('location'), len(fights), 0, utc_now()))
+            self.conn.executemany(
+                f'INSERT INTO fights ({", ".join(FIGHT_ROW_FIELDS)}) '
+                f'VALUES ({", ".join("?" * len(FIGHT_ROW_FIELDS))}) '
+                f'ON CONFLICT (fight_id) DO UPDATE SET '
+                f'{", ".join(f"{field} = excluded.{field}" for field in FIGHT_ROW_FIELDS[1:])} '
+                f'WHERE fights.outcome IS NULL',
+                [fight.to_row() for fight in fights],
+            )
+
+    def complete_event(self, event_id):
+        """Mark an event complete unless one of its fights has no outcome yet; True if it was marked"""
+        with self.conn:
+            cursor = self.conn.execute(
+                'UPDATE events SET complete = 1 WHERE event_id = ? AND NOT EXISTS '
+                '(SELECT 1 FROM fights WHERE fights.event_id = events.event_id AND outcome IS NULL)', (event_id,))
+        return cursor.rowcount > 0
+
+    def has_details(self, fight_id):
+        return self.conn.execute('SELECT 1 FROM fight_details WHERE fight_id = ?', (fight_id,)).fetchone() is not None
+
+    def add_fight_details(self, fight_id, details):
+        """Store what parse_fight_details found: the bout's format and its per-round stat rows"""
+        with self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO fight_details (fight_id, weight_class, time_format, scheduled_rounds, referee) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (fight_id, details['weight_class'], details['time_format'], details['scheduled_rounds'],
+                 details['referee']))
+            self.conn.execute('DELETE FROM fight_stats WHERE fight_id = ?', (fight_id,))
+            columns = ['side', 'round', 'fighter_id'] + STAT_FIELDS
+            self.conn.executemany(
+                f'INSERT INTO fight_stats (fight_id, {", ".join(columns)}) VALUES (?, {", ".join("?" * len(columns))})',
+                [(fight_id,) + tuple(row[key] for key in columns) for row in details['stats']],
+            )
+
+    def fight_stats(self, fight_id=None, fighter_id=None):
+        """Stat rows (one per fighter and round, round 0 = whole fight) for a fight or a fighter"""
+        column, value = ('fight_id', fight_id) if fight_id else ('fighter_id', fighter_id)
+        rows = self.conn.execute(f'SELECT * FROM fight_stats WHERE {column} = ? ORDER BY fight_id, round, side',
+                                 (value,))
+        return [dict(row) for row in rows]
+
+    def iter_fights(self, batch_size=1000):
+        """Every stored fight, once each, read batch_size rows at a time"""
+        cursor = self.conn.execute('SELECT * FROM fights ORDER BY date, fight_id')
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            for row in rows:
+                yield Fight.from_row(row)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def crawl(store, fighters, fetcher=None, on_fighter=None, max_age=None):
+    """Fetch every listed fighter's page and stream its full history into the store
+
+    fighters is an iterable of listing entries ({'id', 'name', 'url'}); at most a small
+    window of pages is in flight, and each history is written as soon as it's parsed.
+    Every bout shows up on both fighters' pages, but only the first page parses it: the
+    second finds its id among the stored ones and just links it. on_fighter(entry,
+    Fighter) sees each page's fighter record; max_age is passed on to Fetcher.get.
+    Returns (fighters crawled, fights parsed, fights linked without parsing).
+    """
+    fetcher = fetcher or get_fetcher()
+    # Only ids, a few bytes per fight ever stored; read by the workers, grown here
+    known = store.fight_ids()
+
+    def fetch_fights(entry):
+        return extract_fighter_history(fetcher.get(entry['url'], max_age).content, entry['url'], known)
+
+    crawled = 0
+    parsed = 0
+    linked = 0
+    for entry, result, error in fetcher.map(fetch_fights, fighters):
+        if error:
+            print(f"❌ {entry['name']}: {error}")
+            continue
+        details, fights = result
+        # Two pages in flight at once may both parse a new bout; the store keeps one row
+        fights = [(fight_id, None if fight_id in known else fight) for fight_id, fight in fights]
+        store.replace_history(entry['id'], entry['name'], fights)
+        known.update(fight_id for fight_id, _ in fights)
+        if on_fighter:
+            on_fighter(entry, details)
+
+        crawled += 1
+        parsed += sum(fight is not None for _, fight in fights)
+        linked += sum(fight is None for _, fight in fights)
+        if crawled % 100 == 0:
+            print(f"   {crawled} fighters, {parsed} fights parsed, {linked} already stored")
+    return crawled, parsed, linked
+
+
+def refresh_fighters(store, fighters, max_age=None):
+    """Refetch the pages of the given fighters ({id: name}) and merge their records into the published data
+
+    Histories go into the store first, so each record is published with last_3_fights
+    derived from it. Returns the ids of the fighters refreshed.
+    """
+    entries = [{'id': fighter_id, 'name': name, 'url': FIGHTER_URL.format(id=fighter_id)}
+               for fighter_id, name in fighters.items() if fighter_id]
+    records = []
+    crawl(store, entries, on_fighter=lambda entry, details: records.append(details), max_age=max_age)
+
+    published = MemoryFighterStore.load(policy=REPLACE)
+    for details in records:
+        record = details.to_dict()
+        record['last_3_fights'] = store.last_fights(record) or []
+        published.upsert(record)
+    published.save()
+    return {details.ufcstats_id for details in records}
+
+
+def derive_last_fights(store, fighters):
+    """Set last_3_fights on every published record the store has a history for; returns how many"""
+    updated = 0
+    for fighter in fighters:
+        fights = store.last_fights(fighter)
+        if fights is not None:
+            fighter['last_3_fights'] = fights
+            updated += 1
+    return updated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawl full fight histories into the fights store")
+    parser.add_argument('command', choices=['crawl', 'derive'],
+                        help="crawl: fetch fighter pages into the store; derive: publish last_3_fights from it")
+    parser.add_argument('--db', default=FIGHTS_DB_PATH)
+    parser.add_argument('--limit', type=int, help="crawl at most this many fighters")
+    parser.add_argument('--max-age-days', type=float,
+                        help="recrawl fighters crawled longer ago than this (default: never)")
+    parser.add_argument('--restart', action='store_true', help="recrawl everyone, ignoring earlier progress")
+    args = parser.parse_args()
+
+    with FightStore(args.db) as store:
+        if args.command == 'crawl':
+            since = None
+            if args.max_age_days is not None:
+                since = (datetime.now(timezone.utc) - timedelta(days=args.max_age_days)).isoformat()
+            done = set() if args.restart else store.crawled_ids(since)
+            index = load_index()
+            pending = [entry for entry in index.fighters if entry['id'] not in done]
+
+            print(f"🥊 Crawling full fight histories ({len(pending)} of {len(index)} fighters pending)")
+            crawled, parsed, linked = crawl(store, islice(pending, args.limit))
+            print(f"\n✅ Crawled {crawled} fighters: {parsed} new fights, {linked} already stored; "
+                  f"store holds {len(store)} fights")
+        else:
+            fighters = load_fighters()
+            updated = derive_last_fights(store, fighters)
+            print(f"Derived last_3_fights for {updated} of {len(fighters)} fighters")
+            publish(fighters)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+import json
+import os
+import threading
+import time
+
+from extractor import fighter_id_from_url
+from fetcher import get_fetcher
+from name_match import NameMatcher
+from parsing import LISTING_PAGE, make_soup
+
+LISTING_URL = "http://ufcstats.com/statistics/fighters?char={letter}&page=all"
+INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'fighter_index.json')
+LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+
+# Listing table columns after First/Last/Nickname
+LISTING_COLUMNS = ['height', 'weight', 'reach', 'stance', 'wins', 'losses', 'draws']
+
+
+def normalize_name(name):
+    """Lowercase and collapse whitespace so 'Tom  Aaron ' and 'tom aaron' compare equal"""
+    return ' '.join(name.lower().split())
+
+
+def parse_listing(html):
+    """Parse every fighter row of a ?char=X&page=all listing page"""
+    soup = make_soup(html, LISTING_PAGE)
+    fighters = []
+
+    table = soup.find('table', class_='b-statistics__table')
+    if not table:
+        return fighters
+
+    for row in table.find_all('tr', class_='b-statistics__table-row'):
+        cols = row.find_all('td')
+        if len(cols) < 3:
+            continue
+
+        name_link = cols[0].find('a') or cols[1].find('a')
+        if not name_link:
+            continue
+
+        first_name = cols[0].text.strip()
+        last_name = cols[1].text.strip()
+        fighter = {
+            'id': fighter_id_from_url(name_link['href']),
+            'url': name_link['href'],
+            'name': ' '.join(f"{first_name} {last_name}".split()),
+            'first_name': first_name,
+            'last_name': last_name,
+            'nickname': cols[2].text.strip(),
+        }
+
+        for key, col in zip(LISTING_COLUMNS, cols[3:]):
+            value = col.text.strip()
+            if key in ('wins', 'losses', 'draws'):
+                value = int(value) if value.isdigit() else 0
+            fighter[key] = value
+
+        fighters.append(fighter)
+
+    return fighters
+
+
+class FighterIndex:
+    """Every fighter on the ufcstats A-Z listing, with O(1) lookup by name and by fighter id"""
+
+    def __init__(self, fighters, built_at=None):
+        self.fighters = fighters
+        self.built_at = built_at or time.time()
+        self.by_id = {}
+        self.by_name = {}
+        self.matcher = None
+
+        for fighter in fighters:
+            self.by_id[fighter['id']] = fighter
+            # Several fighters can share a name; keep all of them, first listed wins on lookup
+            self.by_name.setdefault(normalize_name(fighter['name']), []).append(fighter)
+
+    def __len__(self):
+        return len(self.fighters)
+
+    def lookup(self, name):
+        """Listing entry for an exact (case/whitespace-insensitive) full name, or None"""
+        matches = self.by_name.get(normalize_name(name))
+        return matches[0] if matches else None
+
+    def get(self, fighter_id):
+        """Listing entry for a ufcstats fighter id, or None"""
+        return self.by_id.get(fighter_id)
+
+    def search(self, name, limit=5, min_score=0.5):
+        """Ranked (score, entry) candidates for a name, tolerant of accents, hyphens and typos"""
+        if self.matcher is None:
+            self.matcher = NameMatcher(self.fighters)
+        return self.matcher.search(name, limit=limit, min_score=min_score)
+
+    def resolve(self, name, fuzzy=False, min_score=0.8):
+        """Exact lookup; with fuzzy, falls back to the best candidate scoring at least min_score
+
+        Fuzzy matches are printed with the runner-up candidates and their scores, so a
+        wrong pick shows up in the run's output.
+        """
+        fighter = self.lookup(name)
+        if fighter or not fuzzy:
+            return fighter
+
+        candidates = self.search(name, limit=3, min_score=min_score / 2)
+        if not candidates or candidates[0][0] < min_score:
+            if candidates:
+                print(f"? No match for {name!r} (closest: "
+                      + ', '.join(f"{entry['name']} {score}" for score, entry in candidates) + ")")
+            return None
+
+        print(f"~ {name!r} matched {candidates[0][1]['name']!r} ("
+              + ', '.join(f"{entry['name']} {score}" for score, entry in candidates) + ")")
+        return candidates[0][1]
+
+    def resolve_many(self, names, fuzzy=False, min_score=0.8):
+        """Resolve a batch of names (e.g. a whole card); unresolved names map to None"""
+        return {name: self.resolve(name, fuzzy=fuzzy, min_score=min_score) for name in names}
+
+    def url_for(self, name, fuzzy=False):
+        """fighter-details URL for a full name (fuzzy: see resolve), or None if not listed"""
+        fighter = self.resolve(name, fuzzy=fuzzy)
+        return fighter['url'] if fighter else None
+
+    def age(self):
+        """Seconds since the index was built from the listing pages"""
+        return time.time() - self.built_at
+
+    def save(self, path=INDEX_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'built_at': self.built_at, 'fighters': self.fighters}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=INDEX_PATH):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data['fighters'], built_at=data['built_at'])
+
+    @classmethod
+    def build(cls, fetcher=None, listing_url=LISTING_URL):
+        """Fetch the 26 listing pages once and index every fighter on them"""
+        fetcher = fetcher or get_fetcher()
+
+        def fetch_letter(letter):
+            # The listing changes at most weekly; always ask the server rather than trust the page cache
+            return parse_listing(fetcher.get(listing_url.format(letter=letter), max_age=0).content)
+
+        by_letter = {}
+        for letter, fighters, error in fetcher.map(fetch_letter, LETTERS):
+            if error:
+                raise RuntimeError(f"Could not fetch fighter listing for '{letter.upper()}': {error}")
+            by_letter[letter] = fighters
+
+        return cls([fighter for letter in LETTERS for fighter in by_letter[letter]])
+
+
+def load_index(max_age=24 * 3600, path=INDEX_PATH, fetcher=None):
+    """Load the persisted index, rebuilding it from the listing pages if missing or older than max_age"""
+    try:
+        index = FighterIndex.load(path)
+        if index.age() < max_age:
+            return index
+    except (FileNotFoundError, ValueError, KeyError):
+        pass
+
+    print("Building fighter index from ufcstats listing pages...")
+    index = FighterIndex.build(fetcher=fetcher)
+    index.save(path)
+    print(f"Indexed {len(index)} fighters")
+    return index
+
+
+_default_index = None
+_default_lock = threading.Lock()
+
+
+def get_index():
+    """Return the process-wide fighter index, loading or building it on first use"""
+    global _default_index
+    with _default_lock:
+        if _default_index is None:
+            _default_index = load_index()
+        return _default_index
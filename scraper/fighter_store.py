@@ -0,0 +1,489 @@
+import argparse
+import json
+import os
+import sqlite3
+from bisect import insort
+from collections import Counter
+
+from extractor import utc_now
+from fighter_index import normalize_name
+from ndjson import read_ndjson, write_ndjson
+from normalize import parse_float, weight_class
+from publish import DATA_PATH, file_hash, load_fighters, publish
+from records import FIGHT_FIELDS, Fighter, dump_records, load_records
+
+DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fighters.db')
+
+# What upsert does when the incoming record matches a stored one
+REPLACE = 'replace'          # always take the incoming record
+KEEP_NEWER = 'keep_newer'    # take whichever was scraped more recently
+KEEP_RICHER = 'keep_richer'  # take whichever carries more real data, the stored one on a tie
+POLICIES = (REPLACE, KEEP_NEWER, KEEP_RICHER)
+
+# Display values that mean "nothing scraped here"
+EMPTY_VALUES = {None, '', '--', '0%', '0.00', '0.0', 0}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS fighters (
+    id INTEGER PRIMARY KEY,
+    ufcstats_id TEXT UNIQUE,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    weight_class TEXT,
+    scraped_at TEXT,
+    updated_at TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS fighters_name_key ON fighters (name_key);
+CREATE INDEX IF NOT EXISTS fighters_weight_class ON fighters (weight_class);
+CREATE INDEX IF NOT EXISTS fighters_updated_at ON fighters (updated_at);
+
+CREATE TABLE IF NOT EXISTS fights (
+    fighter_id INTEGER NOT NULL REFERENCES fighters (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    result TEXT,
+    opponent TEXT,
+    method TEXT,
+    round TEXT,
+    PRIMARY KEY (fighter_id, position)
+);
+
+CREATE TABLE IF NOT EXISTS scrape_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT,
+    updated_at TEXT NOT NULL
+);
+"""
+
+
+class FighterStore:
+    """SQLite system of record for fighters, their recent fights and scrape metadata
+
+    WAL mode lets readers and one writer work at the same time, so several refresh jobs
+    can share the database; each upsert touches one row and its fights instead of
+    rewriting the whole file. export() produces the list publish() expects.
+
+    Jobs that still write the published JSON directly are picked up by sync(): the store
+    remembers the hash of the JSON it last read or published, and re-imports it when
+    another job has rewritten it since. Open it through open_store() so that happens.
+    """
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('PRAGMA foreign_keys=ON')
+        self.conn.executescript(SCHEMA)
+
+    def __len__(self):
+        return self.conn.execute('SELECT COUNT(*) FROM fighters').fetchone()[0]
+
+    def _find_row(self, fighter, match_name=None):
+        """Row id of the stored fighter matching a record's ufcstats id, else its (or match_name's) name
+
+        The name only matches rows without a ufcstats id or with the record's own.
+        """
+        if fighter.get('ufcstats_id'):
+            row = self.conn.execute('SELECT id FROM fighters WHERE ufcstats_id = ?', (fighter['ufcstats_id'],)).fetchone()
+            if row:
+                return row['id']
+
+        # A namesake stored under another ufcstats id is a different fighter, not a match
+        name_key = normalize_name(match_name or fighter.get('name', ''))
+        if fighter.get('ufcstats_id'):
+            row = self.conn.execute('SELECT id FROM fighters WHERE name_key = ? AND (ufcstats_id IS NULL OR '
+                                    'ufcstats_id = ?) ORDER BY id LIMIT 1',
+                                    (name_key, fighter['ufcstats_id'])).fetchone()
+        else:
+            row = self.conn.execute('SELECT id FROM fighters WHERE name_key = ? ORDER BY id LIMIT 1',
+                                    (name_key,)).fetchone()
+        return row['id'] if row else None
+
+    def _upsert(self, fighter, match_name=None, insert=False, row_id=None):
+        """Write one fighter and its fights; False if the matched row already held exactly this"""
+        # Fights live in their own table; the null placeholder keeps the key's position
+        data = dict(fighter)
+        if 'last_3_fights' in data:
+            data['last_3_fights'] = None
+        values = (
+            fighter.get('ufcstats_id'),
+            fighter.get('name', ''),
+            normalize_name(fighter.get('name', '')),
+            weight_class(parse_float(fighter.get('weight'))),
+            fighter.get('scraped_at'),
+            utc_now(),
+            json.dumps(data, ensure_ascii=False),
+        )
+        fights = [tuple(fight.get(key) for key in FIGHT_FIELDS) for fight in fighter.get('last_3_fights') or []]
+
+        if not insert and row_id is None:
+            row_id = self._find_row(fighter, match_name)
+        if row_id is not None and self._holds(row_id, values[-1], fights):
+            # Leave updated_at alone so it keeps saying when the fighter last changed
+            return False
+        if row_id is None:
+            cursor = self.conn.execute(
+                'INSERT INTO fighters (ufcstats_id, name, name_key, weight_class, scraped_at, updated_at, data) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)', values)
+            row_id = cursor.lastrowid
+        else:
+            self.conn.execute(
+                'UPDATE fighters SET ufcstats_id = ?, name = ?, name_key = ?, weight_class = ?, '
+                'scraped_at = ?, updated_at = ?, data = ? WHERE id = ?', values + (row_id,))
+            self.conn.execute('DELETE FROM fights WHERE fighter_id = ?', (row_id,))
+
+        self.conn.executemany(
+            'INSERT INTO fights (fighter_id, position, result, opponent, method, round) VALUES (?, ?, ?, ?, ?, ?)',
+            [(row_id, position) + fight for position, fight in enumerate(fights)],
+        )
+        return True
+
+    def _holds(self, row_id, data, fights):
+        row = self.conn.execute('SELECT data FROM fighters WHERE id = ?', (row_id,)).fetchone()
+        if row is None or row['data'] != data:
+            return False
+        stored = self.conn.execute(
+            f'SELECT {", ".join(FIGHT_FIELDS)} FROM fights WHERE fighter_id = ? ORDER BY position', (row_id,))
+        return [tuple(fight) for fight in stored] == fights
+
+    def upsert(self, fighter, match_name=None):
+        """Insert or replace one fighter, matched by ufcstats id, then by name (or match_name)
+
+        Returns False when the stored row was already identical and was left untouched.
+        """
+        with self.conn:
+            return self._upsert(fighter, match_name)
+
+    def upsert_many(self, fighters):
+        """Upsert a batch (any iterable, e.g. a streaming NDJSON reader) in one transaction
+
+        Returns how many fighters were inserted or changed; identical ones aren't rewritten.
+        """
+        count = 0
+        with self.conn:
+            for fighter in fighters:
+                count += self._upsert(fighter)
+        return count
+
+    def insert_many(self, fighters):
+        """Append a batch without matching against stored fighters, e.g. to seed an empty store"""
+        with self.conn:
+            for fighter in fighters:
+                self._upsert(fighter, insert=True)
+
+    def apply(self, upserts=(), deletes=()):
+        """Delete fighters and upsert (record, stored version it replaces or None) pairs in one transaction
+
+        The stored version locates the row even when the new record renames it; if another
+        job has removed that row since, the record is matched (or inserted) on its own.
+        """
+        with self.conn:
+            for fighter in deletes:
+                row_id = self._find_row(fighter)
+                if row_id is not None:
+                    self.conn.execute('DELETE FROM fighters WHERE id = ?', (row_id,))
+            for fighter, previous in upserts:
+                self._upsert(fighter, row_id=self._find_row(previous) if previous else None)
+
+    def sync(self, path=DATA_PATH):
+        """Re-import the published JSON if it changed since the store last read or wrote it
+
+        Its records win over the stored ones (REPLACE); fighters only the store holds are
+        kept, and rows that already match aren't rewritten, so updated_at still marks the
+        fighters that really changed. An empty store is seeded as is. Returns how many
+        records were written.
+        """
+        digest = file_hash(path)
+        if digest is None or digest == self.get_meta('published_hash'):
+            return 0
+
+        fighters = load_fighters(path)
+        if len(self):
+            count = self.upsert_many(fighters)
+            print(f"{path} changed since {self.path} last saw it, re-imported {count} of {len(fighters)} fighters")
+        else:
+            print(f"Seeding {self.path} from {path} ({len(fighters)} fighters)")
+            self.insert_many(fighters)
+            count = len(fighters)
+        self.set_meta('published_hash', digest)
+        return count
+
+    def save(self, targets=None):
+        """Publish every stored fighter (see publish.publish) and remember what was published"""
+        written = publish(self.export(), targets)
+        if targets is None:
+            self.set_meta('published_hash', file_hash(DATA_PATH))
+        return written
+
+    def _records(self, rows):
+        rows = list(rows)
+        fights = {}
+        if rows:
+            placeholders = ','.join('?' * len(rows))
+            for fight in self.conn.execute(
+                    f'SELECT * FROM fights WHERE fighter_id IN ({placeholders}) ORDER BY fighter_id, position',
+                    [row['id'] for row in rows]):
+                fights.setdefault(fight['fighter_id'], []).append(
+                    {key: fight[key] for key in FIGHT_FIELDS if fight[key] is not None})
+
+        records = []
+        for row in rows:
+            data = json.loads(row['data'])
+            if 'last_3_fights' in data or row['id'] in fights:
+                data['last_3_fights'] = fights.get(row['id'], [])
+            records.append(data)
+        return records
+
+    def get(self, ufcstats_id):
+        """Record for a ufcstats fighter id, or None"""
+        records = self._records(self.conn.execute('SELECT * FROM fighters WHERE ufcstats_id = ?', (ufcstats_id,)))
+        return records[0] if records else None
+
+    def find(self, name):
+        """Records whose name matches case/whitespace-insensitively (usually zero or one)"""
+        return self._records(self.conn.execute('SELECT * FROM fighters WHERE name_key = ? ORDER BY id',
+                                               (normalize_name(name),)))
+
+    def by_weight_class(self, division):
+        return self._records(self.conn.execute('SELECT * FROM fighters WHERE weight_class = ? ORDER BY id', (division,)))
+
+    def updated_before(self, timestamp):
+        """Records not upserted since the given ISO timestamp, oldest first"""
+        return self._records(self.conn.execute('SELECT * FROM fighters WHERE updated_at < ? ORDER BY updated_at',
+                                               (timestamp,)))
+
+    def iter_export(self, batch_size=500):
+        """Every fighter in insertion order, read batch_size rows at a time"""
+        cursor = self.conn.execute('SELECT * FROM fighters ORDER BY id')
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield from self._records(rows)
+
+    def export(self):
+        """Every fighter in insertion order, in the shape of public/fighters_data.json"""
+        return list(self.iter_export())
+
+    def get_meta(self, key, default=None):
+        row = self.conn.execute('SELECT value FROM scrape_meta WHERE key = ?', (key,)).fetchone()
+        return json.loads(row['value']) if row else default
+
+    def set_meta(self, key, value):
+        with self.conn:
+            self.conn.execute('INSERT OR REPLACE INTO scrape_meta (key, value, updated_at) VALUES (?, ?, ?)',
+                              (key, json.dumps(value), utc_now()))
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def richness(fighter):
+    """How much real data a record carries: filled-in fields plus fights on record"""
+    filled = sum(1 for key, value in fighter.items()
+                 if key not in ('last_3_fights', 'stats') and not isinstance(value, (dict, list))
+                 and value not in EMPTY_VALUES)
+    return filled + len(fighter.get('last_3_fights') or [])
+
+
+def prefer_incoming(stored, incoming, policy):
+    """True if a conflict policy says the incoming record should replace the stored one"""
+    if policy == KEEP_NEWER:
+        return (incoming.get('scraped_at') or '') >= (stored.get('scraped_at') or '')
+    if policy == KEEP_RICHER:
+        return richness(incoming) > richness(stored)
+    return True
+
+
+class MemoryFighterStore:
+    """The FighterStore's records held in memory with O(1) lookup by ufcstats id and by name
+
+    Batch merges go through upsert_many, which matches each incoming record by ufcstats
+    id, then by normalized name, and settles conflicts with a policy, so merging
+    thousands of refreshed fighters is linear. Records keep their original order; new
+    ones are appended. load() reads the (synced) SQLite store and save() applies only
+    the records upserted or deleted since then to a freshly synced store and publishes
+    it, so writes other jobs made in the meantime are kept.
+    Records are held as slotted Fighter objects (see records.py), a fraction of the
+    memory of the dicts they come in and go out as.
+    """
+
+    def __init__(self, fighters=(), policy=REPLACE, db_path=DB_PATH):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown conflict policy {policy!r}, expected one of {POLICIES}")
+        self.policy = policy
+        self.db_path = db_path
+        self.records = {}
+        self.by_id = {}
+        self.by_name = {}
+        self.next_slot = 0
+        # Slots upserted since load, with the record they replaced (None if inserted), and
+        # the loaded records deleted since; save() applies just these
+        self.changes = {}
+        self.deleted = []
+
+        for fighter in fighters:
+            self._insert(self._record(fighter))
+
+    @classmethod
+    def load(cls, policy=REPLACE, db_path=DB_PATH):
+        with open_store(db_path) as store:
+            return cls(load_records(store.iter_export()), policy=policy, db_path=db_path)
+
+    def save(self, targets=None):
+        """Apply the upserts and deletes since load to the SQLite store and publish it (see FighterStore.save)"""
+        with open_store(self.db_path) as store:
+            store.apply([(self.records[slot].to_dict(), previous and previous.to_dict())
+                         for slot, previous in sorted(self.changes.items())],
+                        [fighter.to_dict() for fighter in self.deleted])
+            self.changes.clear()
+            self.deleted.clear()
+            return store.save(targets)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records.values())
+
+    def __contains__(self, name):
+        return normalize_name(name) in self.by_name
+
+    @staticmethod
+    def _record(fighter):
+        return fighter if isinstance(fighter, Fighter) else Fighter.from_dict(fighter)
+
+    @staticmethod
+    def _first(index, key):
+        slots = index.get(key)
+        return slots[0] if slots else None
+
+    def _keys(self, fighter):
+        return ((self.by_id, fighter.ufcstats_id),
+                (self.by_name, normalize_name(fighter.name) if fighter.name else None))
+
+    def _index(self, slot, fighter):
+        # Every slot holding a key is kept in order, so the first record wins lookups and
+        # the next one takes over when it is replaced or deleted
+        for index, key in self._keys(fighter):
+            if key:
+                insort(index.setdefault(key, []), slot)
+
+    def _unindex(self, slot):
+        for index, key in self._keys(self.records[slot]):
+            slots = index.get(key)
+            if slots and slot in slots:
+                slots.remove(slot)
+                if not slots:
+                    del index[key]
+
+    def _insert(self, fighter):
+        slot = self.next_slot
+        self.next_slot += 1
+        self.records[slot] = fighter
+        self._index(slot, fighter)
+        return slot
+
+    def _slot(self, fighter, match_name=None):
+        slot = self._first(self.by_id, fighter.ufcstats_id)
+        if slot is not None:
+            return slot
+        # A namesake stored under another ufcstats id is a different fighter, not a match
+        for slot in self.by_name.get(normalize_name(match_name or fighter.name), ()):
+            stored_id = self.records[slot].ufcstats_id
+            if not (stored_id and fighter.ufcstats_id) or stored_id == fighter.ufcstats_id:
+                return slot
+        return None
+
+    def get(self, ufcstats_id):
+        """Fighter record for a ufcstats fighter id, or None"""
+        slot = self._first(self.by_id, ufcstats_id)
+        return self.records[slot] if slot is not None else None
+
+    def find(self, name):
+        """First Fighter record with this name (case/whitespace-insensitive), or None"""
+        slot = self._first(self.by_name, normalize_name(name))
+        return self.records[slot] if slot is not None else None
+
+    def upsert(self, fighter, match_name=None, policy=None):
+        """Insert or merge one record (dict or Fighter); returns 'inserted', 'updated' or 'kept'"""
+        fighter = self._record(fighter)
+        slot = self._slot(fighter, match_name)
+        if slot is None:
+            self.changes[self._insert(fighter)] = None
+            return 'inserted'
+
+        if not prefer_incoming(self.records[slot].to_dict(), fighter.to_dict(), policy or self.policy):
+            return 'kept'
+
+        self.changes.setdefault(slot, self.records[slot])
+        self._unindex(slot)
+        self.records[slot] = fighter
+        self._index(slot, fighter)
+        return 'updated'
+
+    def upsert_many(self, fighters, policy=None):
+        """Upsert a batch; returns a Counter of outcomes"""
+        return Counter(self.upsert(fighter, policy=policy) for fighter in fighters)
+
+    def delete(self, name=None, ufcstats_id=None):
+        """Remove the record with this ufcstats id or name; True if one was removed"""
+        slot = (self._first(self.by_id, ufcstats_id) if ufcstats_id
+                else self._first(self.by_name, normalize_name(name or '')))
+        if slot is None:
+            return False
+        previous = self.changes.pop(slot, self.records[slot])
+        if previous is not None:
+            self.deleted.append(previous)
+        self._unindex(slot)
+        del self.records[slot]
+        return True
+
+    def delete_many(self, names):
+        return sum(self.delete(name) for name in names)
+
+    def export(self):
+        """Every record in order, in the shape of public/fighters_data.json"""
+        return dump_records(self.records.values())
+
+
+def open_store(path=DB_PATH, seed_path=DATA_PATH):
+    """Open the store, first re-importing the published JSON if another job rewrote it"""
+    store = FighterStore(path)
+    store.sync(seed_path)
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the SQLite fighter store")
+    parser.add_argument('command', choices=['import', 'export'],
+                        help="import: upsert records into the store; export: publish the store as JSON")
+    parser.add_argument('--db', default=DB_PATH)
+    parser.add_argument('--source', default=DATA_PATH,
+                        help="records to import, JSON array or NDJSON (default: the published JSON)")
+    parser.add_argument('--ndjson', help="export to this NDJSON file instead of publishing")
+    args = parser.parse_args()
+
+    with open_store(args.db) as store:
+        if args.command == 'import':
+            # NDJSON is streamed straight into the transaction, never held in memory
+            records = read_ndjson(args.source) if args.source.endswith('.ndjson') else load_fighters(args.source)
+            count = store.upsert_many(records)
+            print(f"Imported {count} new or changed fighters, store now holds {len(store)}")
+        elif args.ndjson:
+            count = write_ndjson(args.ndjson, store.iter_export())
+            print(f"Exported {count} fighters to {args.ndjson}")
+        else:
+            store.save()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+import argparse
+import glob
+import os
+import sqlite3
+from datetime import date, datetime, timezone
+
+from changes import CHANGES_DIR
+from fight_store import FIGHTER_URL, FIGHTS_DB_PATH, FightStore, refresh_fighters
+from fighter_index import load_index, normalize_name
+from publish import BUNDLE_DIRS, fighter_key, load_fighters, load_json
+from upcoming_card import CARD_NAME, card_fighters
+
+FRONTIER_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'frontier.db')
+
+# Staleness is counted in STALE_DAYS units and capped; never-crawled fighters get the cap
+STALE_DAYS = 30
+STALE_CAP = 6.0
+# A fighter whose last bout is older than this no longer counts as active
+ACTIVE_DAYS = 540
+
+# How much each signal multiplies staleness by; a retired fighter whose page never changes
+# keeps little more than BASE_WEIGHT, so it is only refetched when it gets very stale
+BASE_WEIGHT = 0.25
+CHANGE_WEIGHT = 2.0
+ACTIVITY_WEIGHT = 2.0
+BOOKED_WEIGHT = 20.0
+# Pages scoring below this aren't worth a request even when the budget has room left
+MIN_PRIORITY = 0.5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS frontier (
+    fighter_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    url TEXT NOT NULL,
+    last_crawled TEXT,
+    crawls INTEGER NOT NULL DEFAULT 0,
+    changes INTEGER NOT NULL DEFAULT 0,
+    failures INTEGER NOT NULL DEFAULT 0,
+    last_fight TEXT,
+    booked INTEGER NOT NULL DEFAULT 0,
+    priority REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS frontier_priority ON frontier (priority DESC);
+
+CREATE TABLE IF NOT EXISTS change_reports (
+    name TEXT PRIMARY KEY
+);
+"""
+
+
+def days_since(timestamp, now):
+    """Days between an ISO date or timestamp and now, None if there is none"""
+    if not timestamp:
+        return None
+    try:
+        then = datetime.fromisoformat(timestamp)
+    except ValueError:
+        return None
+    if then.tzinfo is None:
+        then = then.replace(tzinfo=timezone.utc)
+    return max((now - then).total_seconds() / 86400, 0.0)
+
+
+def score(row, now=None):
+    """Crawl priority of one frontier row: staleness times how likely the page is to have moved
+
+    Staleness grows by 1 every STALE_DAYS. It is weighted by the past change rate (changes
+    per crawl, smoothed so new fighters start at one half), by how recently the fighter last
+    fought and by whether they are booked on the upcoming card. Repeated fetch failures
+    push a fighter down so a dead page can't eat every run's budget.
+    """
+    now = now or datetime.now(timezone.utc)
+    age = days_since(row['last_crawled'], now)
+    staleness = STALE_CAP if age is None else min(age / STALE_DAYS, STALE_CAP)
+
+    change_rate = min((row['changes'] + 1) / (row['crawls'] + 2), 1.0)
+    since_fight = days_since(row['last_fight'], now)
+    activity = 0.0 if since_fight is None else max(1 - since_fight / ACTIVE_DAYS, 0.0)
+
+    weight = (BASE_WEIGHT + CHANGE_WEIGHT * change_rate + ACTIVITY_WEIGHT * activity
+              + BOOKED_WEIGHT * row['booked'])
+    return staleness * weight / (1 + row['failures'])
+
+
+class Frontier:
+    """SQLite crawl frontier: the published and booked fighters' pages and the signals scoring them
+
+    sync() folds in what the other jobs leave behind: crawl times (scraped_at of the
+    published records), change reports, fight dates from the fights store and the booked
+    card. Crawls by any job count, so the frontier never needs to be told about them.
+    Published records from before scraped_at was recorded count as never crawled until
+    their first refresh.
+    """
+
+    def __init__(self, path=FRONTIER_DB_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    def __len__(self):
+        return self.conn.execute('SELECT COUNT(*) FROM frontier').fetchone()[0]
+
+    def add(self, entries):
+        """Insert fighters ({'id', 'name', 'url'}) not in the frontier yet; returns how many were new"""
+        with self.conn:
+            cursor = self.conn.executemany(
+                'INSERT OR IGNORE INTO frontier (fighter_id, name, url) VALUES (?, ?, ?)',
+                ((entry['id'], entry['name'], entry.get('url') or FIGHTER_URL.format(id=entry['id']))
+                 for entry in entries if entry.get('id')))
+        return cursor.rowcount
+
+    def retain(self, fighter_ids):
+        """Drop the fighters not in fighter_ids; returns how many were dropped"""
+        stale = [(row['fighter_id'],) for row in self.conn.execute('SELECT fighter_id FROM frontier')
+                 if row['fighter_id'] not in fighter_ids]
+        with self.conn:
+            self.conn.executemany('DELETE FROM frontier WHERE fighter_id = ?', stale)
+        return len(stale)
+
+    def record_crawls(self, crawled):
+        """Count crawls ({id: scraped_at}) newer than the last one seen; a success clears failures"""
+        with self.conn:
+            self.conn.executemany(
+                'UPDATE frontier SET last_crawled = ?, crawls = crawls + 1, failures = 0 '
+                'WHERE fighter_id = ? AND (last_crawled IS NULL OR last_crawled < ?)',
+                ((scraped_at, fighter_id, scraped_at) for fighter_id, scraped_at in crawled.items()))
+
+    def record_failures(self, fighter_ids):
+        with self.conn:
+            self.conn.executemany('UPDATE frontier SET failures = failures + 1 WHERE fighter_id = ?',
+                                  ((fighter_id,) for fighter_id in fighter_ids))
+
+    def record_reports(self, directory=CHANGES_DIR):
+        """Count each modified fighter of every change report not read yet; returns how many reports were read
+
+        Reports key fighters the way publish.fighter_key does: records without a ufcstats
+        id appear under their name slug, which is mapped back to the frontier's id.
+        """
+        seen = {row['name'] for row in self.conn.execute('SELECT name FROM change_reports')}
+        ids = {}
+        for row in self.conn.execute('SELECT fighter_id, name FROM frontier'):
+            ids[row['fighter_id']] = row['fighter_id']
+            ids.setdefault(fighter_key({'name': row['name']}), row['fighter_id'])
+        paths = sorted(path for path in glob.glob(os.path.join(directory, '*.json'))
+                       if os.path.basename(path) != 'latest.json' and os.path.basename(path) not in seen)
+        with self.conn:
+            for path in paths:
+                report = load_json(path, {})
+                self.conn.executemany('UPDATE frontier SET changes = changes + 1 WHERE fighter_id = ?',
+                                      ((ids[key],) for key in report.get('modified', {}) if key in ids))
+                self.conn.execute('INSERT INTO change_reports (name) VALUES (?)', (os.path.basename(path),))
+        return len(paths)
+
+    def set_activity(self, last_fights, booked):
+        """Store each fighter's last fight date ({id: date}) and booked flag (ids on the card)"""
+        with self.conn:
+            self.conn.execute('UPDATE frontier SET booked = 0 WHERE booked = 1')
+            self.conn.executemany('UPDATE frontier SET last_fight = ? WHERE fighter_id = ?',
+                                  ((fight_date, fighter_id) for fighter_id, fight_date in last_fights.items()))
+            self.conn.executemany('UPDATE frontier SET booked = 1 WHERE fighter_id = ?',
+                                  ((fighter_id,) for fighter_id in booked))
+
+    def rescore(self, now=None):
+        """Recompute every priority from the stored signals"""
+        now = now or datetime.now(timezone.utc)
+        rows = self.conn.execute('SELECT * FROM frontier').fetchall()
+        with self.conn:
+            self.conn.executemany('UPDATE frontier SET priority = ? WHERE fighter_id = ?',
+                                  ((score(row, now), row['fighter_id']) for row in rows))
+
+    def top(self, limit, min_priority=0.0):
+        """The limit highest-priority frontier rows scoring at least min_priority"""
+        rows = self.conn.execute('SELECT * FROM frontier WHERE priority >= ? ORDER BY priority DESC LIMIT ?',
+                                 (min_priority, limit))
+        return [dict(row) for row in rows]
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def booked_fighters(directory=BUNDLE_DIRS[0], today=None):
+    """{id: name} of the fighters on the card upcoming_card.py wrote, unless that event is already past"""
+    card = load_json(os.path.join(directory, CARD_NAME))
+    if not card or (card['event'].get('date') or '') < (today or date.today()).isoformat():
+        return {}
+    return card_fighters(card['bouts'])
+
+
+def sync(frontier, store, fighters=None):
+    """Bring the frontier up to date with the published records, change reports, fights and card
+
+    Only published and booked fighters are crawled: the rest of the index is mostly
+    retired fighters the app doesn't show, and refreshing them would add them to the
+    published roster. Older published records carry no ufcstats id; they are matched to
+    the index by name.
+    """
+    fighters = load_fighters() if fighters is None else fighters
+    by_name = {normalize_name(entry['name']): entry['id'] for entry in load_index().fighters}
+    ids = [fighter.get('ufcstats_id') or by_name.get(normalize_name(fighter.get('name', ''))) for fighter in fighters]
+    booked = booked_fighters()
+
+    frontier.retain(set(ids) | set(booked))
+    added = frontier.add({'id': fighter_id, 'name': fighter.get('name', '')} for fighter_id, fighter in zip(ids, fighters))
+    added += frontier.add({'id': fighter_id, 'name': name} for fighter_id, name in booked.items())
+    frontier.record_crawls({fighter_id: fighter['scraped_at'] for fighter_id, fighter in zip(ids, fighters)
+                            if fighter_id and fighter.get('scraped_at')})
+    reports = frontier.record_reports()
+    frontier.set_activity(store.last_fight_dates(), booked)
+    frontier.rescore()
+    return added, reports
+
+
+def drain(frontier, store, budget):
+    """Refetch up to budget of the highest-priority fighter pages (one request each) and publish them
+
+    Pages below MIN_PRIORITY are left alone, so a quiet day spends less than the budget.
+    The frontier only holds published and booked fighters (see sync), so the only records
+    this can add to the roster are booked newcomers, as upcoming_card.py does.
+    Returns the ids refreshed. Fetches are revalidated (max_age=0) so every request
+    of the budget goes to a page the frontier chose, not to the HTTP cache.
+    """
+    entries = frontier.top(budget, MIN_PRIORITY)
+    if not entries:
+        return set()
+    refreshed = refresh_fighters(store, {entry['fighter_id']: entry['name'] for entry in entries}, max_age=0)
+    frontier.record_failures(entry['fighter_id'] for entry in entries if entry['fighter_id'] not in refreshed)
+    return refreshed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawl the fighter pages most likely to have changed, within a budget")
+    parser.add_argument('command', choices=['sync', 'show', 'drain'],
+                        help="sync: rescore from the latest data; show: print the top of the frontier; "
+                             "drain: sync, then refetch the top fighters")
+    parser.add_argument('--budget', type=int, default=200, help="fighter pages to request per drain (default 200)")
+    parser.add_argument('--limit', type=int, default=20, help="rows to show")
+    parser.add_argument('--db', default=FRONTIER_DB_PATH)
+    parser.add_argument('--fights-db', default=FIGHTS_DB_PATH)
+    args = parser.parse_args()
+
+    with Frontier(args.db) as frontier, FightStore(args.fights_db) as store:
+        if args.command in ('sync', 'drain'):
+            added, reports = sync(frontier, store)
+            print(f"🧭 Frontier holds {len(frontier)} fighters ({added} new, {reports} change reports read)")
+
+        if args.command == 'show':
+            for row in frontier.top(args.limit):
+                flags = ' 📅' if row['booked'] else ''
+                print(f"{row['priority']:8.2f}  {row['name']:<30} crawled {row['last_crawled'] or 'never'}, "
+                      f"{row['changes']}/{row['crawls']} changed, last fight {row['last_fight'] or '--'}{flags}")
+        elif args.command == 'drain':
+            print(f"\n🔄 Refreshing up to {args.budget} fighters...")
+            refreshed = drain(frontier, store, args.budget)
+            sync(frontier, store)
+            print(f"\n✅ Refreshed {len(refreshed)} of {args.budget} budgeted fighters")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'http')
+
+
+class HTTPCache:
+    """On-disk response cache keyed by URL hash, with TTLs, LRU size bound and revalidation validators
+
+    Each entry is two files under <directory>/<key[:2]>/: the raw body and a small JSON
+    sidecar with the URL, ETag, Last-Modified and fetch time. Reads bump the body's mtime,
+    which is what LRU eviction sorts on.
+    """
+
+    def __init__(self, directory=CACHE_DIR, ttl=6 * 3600, max_bytes=512 * 1024 * 1024):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.total_bytes = None
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.directory, key[:2], key)
+        return base + '.body', base + '.json'
+
+    def get(self, url):
+        """Return the cached entry for a URL (meta dict plus 'body'), or None"""
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            with open(body_path, 'rb') as f:
+                entry['body'] = f.read()
+            if entry.get('url') != url:
+                return None
+            # Touch the body for LRU eviction; another process may have just evicted it
+            os.utime(body_path)
+        except (FileNotFoundError, ValueError):
+            return None
+        return entry
+
+    def is_fresh(self, entry, ttl=None):
+        """True if the entry is younger than its TTL and can be served without revalidating"""
+        ttl = self.ttl if ttl is None else ttl
+        return time.time() - entry['fetched_at'] < ttl
+
+    def validators(self, entry):
+        """Conditional request headers for revalidating an entry"""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url, body, headers):
+        """Write a fresh response body and its validators"""
+        body_path, meta_path = self._paths(url)
+        os.makedirs(os.path.dirname(body_path), exist_ok=True)
+
+        try:
+            previous = os.path.getsize(body_path)
+        except FileNotFoundError:
+            previous = 0
+
+        meta = {
+            'url': url,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'content_type': headers.get('Content-Type'),
+            'fetched_at': time.time(),
+            'size': len(body),
+        }
+        _write_atomic(body_path, body)
+        _write_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+
+        with self.lock:
+            if self.total_bytes is None:
+                self.total_bytes = self._scan_size()
+            else:
+                self.total_bytes += len(body) - previous
+
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def touch(self, url):
+        """Mark an entry as revalidated (after a 304) so its TTL starts again"""
+        _, meta_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+
+        meta['fetched_at'] = time.time()
+        _write_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+
+    def _entries(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith('.body'):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    yield path, stat.st_size, stat.st_mtime
+
+    def _scan_size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        """Drop least recently used entries until the cache is back under 90% of max_bytes"""
+        target = self.max_bytes * 0.9
+        for path, size, _ in sorted(self._entries(), key=lambda e: e[2]):
+            if self.total_bytes <= target:
+                break
+            for stale in (path, path[:-len('.body')] + '.json'):
+                try:
+                    os.remove(stale)
+                except FileNotFoundError:
+                    pass
+            self.total_bytes -= size
+
+    def clear(self):
+        """Remove every cached entry"""
+        with self.lock:
+            for path, _, _ in list(self._entries()):
+                for stale in (path, path[:-len('.body')] + '.json'):
+                    try:
+                        os.remove(stale)
+                    except FileNotFoundError:
+                        pass
+            self.total_bytes = 0
+
+
+def _write_atomic(path, data):
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
@@ -0,0 +1,71 @@
+import os
+
+from ndjson import NDJSONWriter, read_ndjson
+
+JOURNAL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'jobs')
+
+
+def journal_path(job):
+    """Default journal location for a named job, e.g. 'ufc_scraper'"""
+    return os.path.join(JOURNAL_DIR, f"{job}.jsonl")
+
+
+class ScrapeJournal:
+    """Append-only progress log for a scrape job: one JSON line per finished fighter
+
+    Each line is flushed and fsynced as soon as the fighter is done, so a job that
+    crashes or gets throttled halfway can be restarted and only fetch what's left.
+    A line cut short by the crash is dropped (and trimmed off the file) on load.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.done = {}
+        if os.path.exists(path):
+            for entry in read_ndjson(path, repair=True):
+                self.done[entry['url']] = entry['fighter']
+        self.writer = NDJSONWriter(path, append=True, fsync=True)
+
+    def __len__(self):
+        return len(self.done)
+
+    def __contains__(self, url):
+        return url in self.done
+
+    def record(self, url, fighter):
+        """Append one finished fighter and make sure it's on disk before moving on"""
+        self.writer.write({'url': url, 'fighter': fighter})
+        self.done[url] = fighter
+
+    def pending(self, urls):
+        """The given URLs that aren't in the journal yet, in order"""
+        return [url for url in urls if url not in self.done]
+
+    def close(self):
+        self.writer.close()
+
+    def discard(self):
+        """Close and delete the journal once its results have been published"""
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_journal(job, restart=False):
+    """Open the journal for a job, resuming from whatever a previous run finished unless restart"""
+    path = journal_path(job)
+    if restart and os.path.exists(path):
+        os.remove(path)
+
+    journal = ScrapeJournal(path)
+    if len(journal):
+        print(f"Resuming {job}: {len(journal)} fighters already done in {path}")
+    return journal
@@ -0,0 +1,91 @@
+import re
+import unicodedata
+from collections import defaultdict
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def fold(text):
+    """Lowercase and strip accents, so 'José Aldo' and 'Jose Aldo' fold to the same string"""
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def tokens(name):
+    """Accent-folded alphanumeric tokens; hyphens, apostrophes and dots act as separators"""
+    return TOKEN_RE.findall(fold(name))
+
+
+def trigrams(compact):
+    """Character trigrams of a compacted name, padded so short names still produce a few"""
+    padded = f"  {compact} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameMatcher:
+    """Ranked fuzzy lookup over fighter names using folded tokens and character trigrams
+
+    Two keys are exact hits: the tokens joined without separators ('Chang-Ho Lee',
+    'ChangHo Lee' and 'Chang Ho Lee' all become 'changholee'), and the same with tokens
+    sorted, which catches family-name-first spellings. Anything else is scored by the
+    Dice coefficient of trigram sets, gathered from an inverted index so only names
+    sharing at least one trigram with the query are ever looked at.
+    """
+
+    def __init__(self, entries, key=lambda entry: entry['name']):
+        self.entries = []
+        self.key = key
+        self.compact = defaultdict(list)
+        self.sorted_compact = defaultdict(list)
+        self.postings = defaultdict(list)
+        self.gram_counts = []
+
+        for entry in entries:
+            self.add(entry)
+
+    def add(self, entry):
+        position = len(self.entries)
+        parts = tokens(self.key(entry))
+        compact = ''.join(parts)
+        grams = trigrams(compact)
+
+        self.entries.append(entry)
+        self.gram_counts.append(len(grams))
+        self.compact[compact].append(position)
+        self.sorted_compact[''.join(sorted(parts))].append(position)
+        for gram in grams:
+            self.postings[gram].append(position)
+
+    def search(self, name, limit=5, min_score=0.5):
+        """Return up to `limit` (score, entry) pairs, best first, scoring between 0 and 1"""
+        parts = tokens(name)
+        if not parts:
+            return []
+
+        compact = ''.join(parts)
+        scores = {}
+        for position in self.compact.get(compact, ()):
+            scores[position] = 1.0
+        for position in self.sorted_compact.get(''.join(sorted(parts)), ()):
+            scores.setdefault(position, 0.98)
+
+        grams = trigrams(compact)
+        shared = defaultdict(int)
+        for gram in grams:
+            for position in self.postings.get(gram, ()):
+                shared[position] += 1
+
+        for position, count in shared.items():
+            if position not in scores:
+                scores[position] = 2.0 * count / (len(grams) + self.gram_counts[position])
+
+        ranked = sorted(
+            ((score, position) for position, score in scores.items() if score >= min_score),
+            key=lambda pair: (-pair[0], pair[1]),
+        )
+        return [(round(score, 3), self.entries[position]) for score, position in ranked[:limit]]
+
+    def best(self, name, min_score=0.8):
+        """The single best match scoring at least min_score, or None"""
+        matches = self.search(name, limit=1, min_score=min_score)
+        return matches[0][1] if matches else None
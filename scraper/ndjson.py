@@ -0,0 +1,96 @@
+import json
+import os
+
+
+def read_ndjson(path, repair=False):
+    """Yield one record per line without loading the whole file
+
+    A last line without a newline is still a record if it parses (repair=True adds the
+    newline). If it doesn't, it was cut short by a crash: with repair=True it is trimmed
+    off the file so later appends start on a clean line, otherwise it raises ValueError like any other line
+    that isn't valid JSON, with its line number. Blank lines are skipped.
+    """
+    good_end = 0
+    terminated = True
+    with open(path, 'rb') as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                good_end += len(line)
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                if repair and not line.endswith(b'\n'):
+                    break
+                raise ValueError(f"{path}:{number}: malformed NDJSON line: {e}") from None
+            good_end += len(line)
+            terminated = line.endswith(b'\n')
+            yield record
+
+    if repair and good_end < os.path.getsize(path):
+        with open(path, 'r+b') as f:
+            f.truncate(good_end)
+    elif repair and not terminated:
+        with open(path, 'ab') as f:
+            f.write(b'\n')
+
+
+class NDJSONWriter:
+    """Write records one JSON line at a time
+
+    In the default mode lines go to a temp file that replaces path on close, so readers
+    only ever see the previous file or the complete new one. With append=True lines are
+    added to the existing file as they come, and fsync=True makes each line durable
+    before write() returns (for progress logs that must survive a crash).
+    """
+
+    def __init__(self, path, append=False, fsync=False):
+        self.path = path
+        self.append = append
+        self.fsync = fsync
+        self.count = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.file = open(path if append else f"{path}.tmp", 'a' if append else 'w', encoding='utf-8')
+
+    def write(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.count += 1
+        if self.fsync:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+        return self.count
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+        if not self.append:
+            os.replace(f"{self.path}.tmp", self.path)
+
+    def abort(self):
+        """Drop a replace-mode write without touching the existing file"""
+        self.file.close()
+        if not self.append and os.path.exists(f"{self.path}.tmp"):
+            os.remove(f"{self.path}.tmp")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        if exc_type is not None and not self.append:
+            self.abort()
+        else:
+            self.close()
+
+
+def write_ndjson(path, records):
+    """Atomically replace path with one line per record; returns how many were written"""
+    with NDJSONWriter(path) as writer:
+        return writer.write_many(records)
@@ -0,0 +1,112 @@
+import re
+from datetime import datetime
+
+# Display fields parsed as plain floats (per-minute / per-15-minute rates)
+RATE_FIELDS = [
+    'sig_strikes_landed_per_min',
+    'sig_strikes_absorbed_per_min',
+    'takedown_avg',
+    'submission_avg',
+]
+
+# Display fields like "38%", kept in percent units (38.0) as the app has always used them
+PERCENT_FIELDS = [
+    'striking_accuracy',
+    'striking_defense',
+    'takedown_accuracy',
+    'takedown_defense',
+]
+
+# Upper weight limit (lbs) of each division, as the app's detectWeightClass uses them
+WEIGHT_CLASSES = [
+    (125, 'Flyweight'),
+    (135, 'Bantamweight'),
+    (145, 'Featherweight'),
+    (155, 'Lightweight'),
+    (170, 'Welterweight'),
+    (185, 'Middleweight'),
+    (205, 'Light Heavyweight'),
+]
+
+NUMBER_RE = re.compile(r'-?\d+(?:\.\d+)?')
+HEIGHT_RE = re.compile(r"(\d+)'\s*(?:(\d+(?:\.\d+)?)\")?")
+MISSING = {'', '--', 'N/A'}
+
+
+def parse_float(text):
+    """First number in a display string ('3.29', '155 lbs.', '72.0"', '38%'), None when missing"""
+    if text is None:
+        return None
+    if isinstance(text, (int, float)):
+        return float(text)
+    if text.strip() in MISSING:
+        return None
+
+    match = NUMBER_RE.search(text)
+    return float(match.group()) if match else None
+
+
+def parse_height(text):
+    """Height in inches from 5' 11", None when missing"""
+    if not text or text.strip() in MISSING:
+        return None
+
+    match = HEIGHT_RE.search(text)
+    if not match:
+        return parse_float(text)
+    return int(match.group(1)) * 12 + float(match.group(2) or 0)
+
+
+def parse_dob(text):
+    """ISO date from a ufcstats DOB like 'Jul 13, 1978', None when missing or unparseable"""
+    if not text or text.strip() in MISSING:
+        return None
+
+    try:
+        return datetime.strptime(text.strip(), "%b %d, %Y").date().isoformat()
+    except ValueError:
+        return None
+
+
+def parse_date(text):
+    """ISO date from an event date like 'Jul. 13, 2024', 'Sept. 7, 2024' or 'April 13, 2024', None when unparseable"""
+    if not text:
+        return None
+
+    text = ' '.join(text.replace('.', '').replace('Sept ', 'Sep ').split())
+    for date_format in ("%b %d, %Y", "%B %d, %Y"):
+        try:
+            return datetime.strptime(text, date_format).date().isoformat()
+        except ValueError:
+            pass
+    return None
+
+
+def weight_class(weight_lbs):
+    """Division for a weight in pounds, None when the weight is unknown"""
+    if not weight_lbs:
+        return None
+    for limit, name in WEIGHT_CLASSES:
+        if weight_lbs <= limit:
+            return name
+    return 'Heavyweight'
+
+
+def numeric_stats(fighter):
+    """Typed copy of a fighter's display stats: inches, pounds, floats, ISO dob and None for '--'"""
+    stats = {
+        'height_in': parse_height(fighter.get('height')),
+        'weight_lbs': parse_float(fighter.get('weight')),
+        'reach_in': parse_float(fighter.get('reach')),
+        'dob': parse_dob(fighter.get('dob')),
+    }
+    for key in RATE_FIELDS + PERCENT_FIELDS:
+        stats[key] = parse_float(fighter.get(key))
+    return stats
+
+
+def add_numeric_stats(fighters):
+    """Recompute the 'stats' record of every fighter from its display fields, in place"""
+    for fighter in fighters:
+        fighter['stats'] = numeric_stats(fighter)
+    return fighters
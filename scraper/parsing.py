@@ -0,0 +1,41 @@
+from bs4 import BeautifulSoup, SoupStrainer
+
+
+def has_class(*names):
+    """SoupStrainer class matcher that accepts an element carrying any of the given class names"""
+    wanted = frozenset(names)
+
+    def match(value):
+        # While a strained parse is running the class attribute is still the raw
+        # space-separated string, so compare its individual names
+        return bool(value) and not wanted.isdisjoint(value.split())
+
+    return match
+
+
+# Only the subtrees the extractors read: the title (name + record), the nickname, the
+# two info boxes (bio details and career stats) and the fight history table
+FIGHTER_PAGE = SoupStrainer(class_=has_class(
+    'b-content__title',
+    'b-content__Nickname',
+    'b-list__info-box',
+    'b-fight-details__table',
+))
+
+LISTING_PAGE = SoupStrainer('table', class_=has_class('b-statistics__table'))
+
+EVENTS_PAGE = SoupStrainer('table', class_=has_class('b-statistics__table-events'))
+
+# Event title, the date/location box and the fight table
+EVENT_PAGE = SoupStrainer(class_=has_class(
+    'b-content__title',
+    'b-list__box-list',
+    'b-fight-details__table',
+))
+
+
+def make_soup(html, parse_only=None, fast=True):
+    """Parse HTML with lxml restricted to the given subtrees, or the full html.parser tree when fast=False"""
+    if not fast:
+        return BeautifulSoup(html, 'html.parser')
+    return BeautifulSoup(html, 'lxml', parse_only=parse_only)
@@ -0,0 +1,374 @@
+import argparse
+import glob
+import gzip
+import hashlib
+import json
+import os
+
+from changes import build_changeset, is_empty, summary, write_report
+from name_match import tokens
+from ndjson import read_ndjson
+from normalize import add_numeric_stats
+
+try:
+    import brotli
+except ImportError:  # optional: without it only the .gz variant is written
+    brotli = None
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_PATH = os.path.join(PROJECT_DIR, 'public', 'fighters_data.json')
+
+# Everywhere the app may load fighter data from: the dev server serves public/, Netlify serves dist/
+TARGETS = [
+    DATA_PATH,
+    os.path.join(PROJECT_DIR, 'public', 'fighters_data_new.json'),
+    os.path.join(PROJECT_DIR, 'dist', 'fighters_data.json'),
+    os.path.join(PROJECT_DIR, 'dist', 'fighters_data_new.json'),
+]
+
+# Minified, content-hashed bundle and its manifest, served from /data/ by the app
+BUNDLE_DIRS = [
+    os.path.join(PROJECT_DIR, 'public', 'data'),
+    os.path.join(PROJECT_DIR, 'dist', 'data'),
+]
+BUNDLE_URL = '/data'
+MANIFEST_NAME = 'manifest.json'
+HASHES_NAME = 'hashes.json'
+STALE_PATTERNS = ['fighters.*.json*', 'index.*.json*', 'shards/fighters-*.json*']
+
+# Columns of the compact fighter index, one row per fighter
+INDEX_FIELDS = ['id', 'name', 'nickname', 'weight', 'wins', 'losses', 'draws', 'shard']
+
+
+def load_fighters(path=DATA_PATH):
+    """The fighter list from a JSON array or an NDJSON file, or [] if there is none yet"""
+    try:
+        if path.endswith('.ndjson'):
+            return list(read_ndjson(path))
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return []
+
+
+def load_json(path, default=None):
+    """Parsed contents of a JSON file, or default if it doesn't exist"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+
+
+def file_hash(path):
+    """sha256 of a file's contents, or None if it doesn't exist"""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def fsync_dir(directory):
+    """Flush a rename to disk; a no-op where directories can't be opened (Windows)"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_atomic(path, data):
+    """Write bytes to a temp file next to path, fsync it and rename it into place"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    fsync_dir(os.path.dirname(path))
+
+
+def link_atomic(source, path):
+    """Put a hardlink to source at path via a temp name, copying when the two can't share an inode"""
+    tmp_path = f"{path}.tmp"
+    try:
+        if os.path.lexists(tmp_path):
+            os.remove(tmp_path)
+        os.link(source, tmp_path)
+    except OSError:
+        with open(source, 'rb') as f:
+            write_atomic(path, f.read())
+        return
+    os.replace(tmp_path, path)
+    fsync_dir(os.path.dirname(path))
+
+
+def publish(fighters, targets=None):
+    """Serialize the fighter list once and atomically replace every target that differs
+
+    A reader never sees a half-written file: the first stale target is written to a temp
+    file, fsynced and renamed into place, and the others are hardlinked (or copied) from
+    it the same way. Targets already holding identical content are left untouched, and
+    targets whose directory doesn't exist (dist/ before a build) are skipped. Every record
+    gets a fresh typed 'stats' copy of its display fields (see normalize.py). The default
+    targets also get a change report (see report_changes) and the minified bundle (see
+    publish_bundle). Returns the paths written.
+    """
+    bundle = targets is None
+    targets = [os.path.abspath(path) for path in targets or TARGETS]
+    add_numeric_stats(fighters)
+    data = json.dumps(fighters, indent=2, ensure_ascii=False).encode('utf-8')
+    digest = hashlib.sha256(data).hexdigest()
+
+    records = None
+    if bundle:
+        records = keyed_records(fighters)
+        if file_hash(DATA_PATH) != digest:
+            # Has to run before DATA_PATH is replaced: it still holds the previous run's records
+            report_changes(records)
+
+    written = []
+    source = None
+    for path in targets:
+        if not os.path.isdir(os.path.dirname(path)):
+            print(f"Skipping {path}: directory doesn't exist")
+            continue
+        if file_hash(path) == digest:
+            continue
+
+        if source is None:
+            write_atomic(path, data)
+            source = path
+        else:
+            link_atomic(source, path)
+        written.append(path)
+
+    if written:
+        print(f"\nPublished {len(fighters)} fighters to {', '.join(os.path.relpath(p, PROJECT_DIR) for p in written)}")
+    else:
+        print(f"\nFighter data unchanged ({len(fighters)} fighters), nothing to publish")
+
+    if bundle:
+        written.extend(publish_bundle(fighters, records=records))
+    return written
+
+
+def report_changes(records, directory=None):
+    """Diff this run's records against the published ones and save the change set
+
+    The previous per-fighter hashes come from hashes.json in the bundle directory, so only
+    fighters whose hash moved are compared field by field. Returns the change set.
+    """
+    hashes = record_hashes(records)
+    previous = keyed_records(load_fighters(DATA_PATH), encode=False)
+    previous_hashes = load_json(os.path.join(directory or BUNDLE_DIRS[0], HASHES_NAME))
+    if previous_hashes is None:
+        previous = keyed_records([fighter for _, _, fighter, _ in previous])
+        previous_hashes = record_hashes(previous)
+
+    changeset = build_changeset(previous_hashes, hashes,
+                                {key: fighter for key, _, fighter, _ in previous},
+                                {key: fighter for key, _, fighter, _ in records})
+    if is_empty(changeset):
+        print(f"No fighter changes ({summary(changeset)})")
+    else:
+        path = write_report(changeset)
+        print(f"Changes: {summary(changeset)} -> {os.path.relpath(path, PROJECT_DIR)}")
+    return changeset
+
+
+def compressed_variants(data):
+    """(suffix, bytes) pairs for the precompressed copies of a data file"""
+    # mtime=0 keeps the .gz byte-identical across runs for the same content
+    variants = [('.gz', gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append(('.br', brotli.compress(data, quality=11)))
+    return variants
+
+
+def minify(obj):
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def hashed_name(stem, data):
+    """File name carrying a content hash, so it can be cached forever"""
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}.json"
+
+
+def fighter_key(fighter):
+    """Stable id the app uses for a fighter: the ufcstats id, or a name slug for records without one"""
+    return fighter.get('ufcstats_id') or '-'.join(tokens(fighter['name']))
+
+
+def shard_key(fighter):
+    """Shard a fighter's full record lives in: the folded first letter of the name, '_' otherwise"""
+    parts = tokens(fighter['name'])
+    letter = parts[0][0] if parts else '_'
+    return letter if 'a' <= letter <= 'z' else '_'
+
+
+def keyed_records(fighters, encode=True):
+    """(id, shard, fighter, minified bytes) for every named fighter, ids made unique the way the app sees them
+
+    With encode=False the bytes are None, for callers that only need the ids.
+    """
+    records = []
+    seen = set()
+    for fighter in fighters:
+        if not fighter.get('name'):
+            continue
+
+        key = fighter_key(fighter)
+        if key in seen:
+            key = f"{key}-{len(records)}"
+        seen.add(key)
+        records.append((key, shard_key(fighter), fighter, minify(fighter) if encode else None))
+    return records
+
+
+def record_hashes(records):
+    """Per-fighter content hashes grouped by shard, {shard: {id: hash}}, as hashes.json holds them"""
+    hashes = {}
+    for key, shard, _, data in records:
+        hashes.setdefault(shard, {})[key] = hashlib.sha256(data).hexdigest()[:16]
+    return dict(sorted(hashes.items()))
+
+
+def build_data_files(fighters, records=None, reuse=None):
+    """Every content-hashed file under data/ as {relative path: bytes}, plus the manifest naming them
+
+    Three views of the same list: the full minified bundle, a compact index (just what
+    the fighter selector shows) and per-letter shards of full records keyed by fighter
+    id, so the app only downloads the records of the fighters actually picked. Shards
+    listed in reuse ({shard: existing file name}) hold exactly the same records as
+    before, so they aren't serialized again and map to None.
+    """
+    records = records or keyed_records(fighters)
+    reuse = reuse or {}
+    files = {}
+
+    bundle = minify(fighters)
+    bundle_name = hashed_name('fighters', bundle)
+    files[bundle_name] = bundle
+
+    rows = []
+    shards = {}
+    for key, shard, fighter, data in records:
+        shards.setdefault(shard, []).append((key, data))
+        rows.append([key] + [fighter.get(field) for field in INDEX_FIELDS[1:-1]] + [shard])
+
+    index = minify({'fields': INDEX_FIELDS, 'rows': rows})
+    index_name = hashed_name('index', index)
+    files[index_name] = index
+
+    shard_files = {}
+    for shard, members in sorted(shards.items()):
+        if shard in reuse:
+            name = reuse[shard]
+            files[name] = None
+        else:
+            # Same bytes as minify({id: record, ...}), reusing each record's encoding
+            data = b'{' + b','.join(minify(key) + b':' + body for key, body in members) + b'}'
+            name = f"shards/{hashed_name(f'fighters-{shard}', data)}"
+            files[name] = data
+        shard_files[shard] = f"{BUNDLE_URL}/{name}"
+
+    manifest = {
+        'fighters': {
+            'file': f"{BUNDLE_URL}/{bundle_name}",
+            'sha256': hashlib.sha256(bundle).hexdigest(),
+            'count': len(fighters),
+            'bytes': len(bundle),
+        },
+        'index': {
+            'file': f"{BUNDLE_URL}/{index_name}",
+            'count': len(rows),
+            'bytes': len(index),
+        },
+        'shards': shard_files,
+        'hashes': f"{BUNDLE_URL}/{HASHES_NAME}",
+    }
+    return files, json.dumps(manifest, indent=2).encode('utf-8')
+
+
+def untouched_shards(directory, hashes):
+    """{shard: file name} for the shards in directory whose records all kept their content hash"""
+    previous_hashes = load_json(os.path.join(directory, HASHES_NAME), {})
+    previous_manifest = load_json(os.path.join(directory, MANIFEST_NAME), {})
+
+    reuse = {}
+    for shard, url in previous_manifest.get('shards', {}).items():
+        name = url[len(BUNDLE_URL) + 1:]
+        if previous_hashes.get(shard) == hashes.get(shard) and os.path.exists(os.path.join(directory, name)):
+            reuse[shard] = name
+    return reuse
+
+
+def publish_bundle(fighters, directories=None, records=None):
+    """Write the hashed data files (+ .gz/.br) under data/ and point manifest.json at them
+
+    Hashed names let the files be cached forever; only the small manifest has to be
+    revalidated. Files are written before the manifest, so a reader following it always
+    finds them, and files the new manifest no longer names are removed afterwards.
+    hashes.json keeps each fighter's content hash, so shards whose records didn't change
+    are neither re-serialized nor rewritten on the next run. Returns the paths written.
+    """
+    records = records or keyed_records(fighters)
+    hashes = record_hashes(records)
+    hashes_data = json.dumps(hashes, indent=1).encode('utf-8')
+
+    written = []
+    for directory in directories or BUNDLE_DIRS:
+        if not os.path.isdir(os.path.dirname(directory)):
+            continue
+        os.makedirs(os.path.join(directory, 'shards'), exist_ok=True)
+
+        files, manifest = build_data_files(fighters, records, untouched_shards(directory, hashes))
+        manifest_path = os.path.join(directory, MANIFEST_NAME)
+        hashes_path = os.path.join(directory, HASHES_NAME)
+        if (file_hash(manifest_path) == hashlib.sha256(manifest).hexdigest()
+                and file_hash(hashes_path) == hashlib.sha256(hashes_data).hexdigest()):
+            continue
+
+        new_files = 0
+        new_bytes = 0
+        for name, data in files.items():
+            path = os.path.join(directory, name)
+            if data is None or os.path.exists(path):
+                continue
+            write_atomic(path, data)
+            for suffix, body in compressed_variants(data):
+                write_atomic(path + suffix, body)
+            written.append(path)
+            new_files += 1
+            new_bytes += len(data)
+        write_atomic(hashes_path, hashes_data)
+        write_atomic(manifest_path, manifest)
+
+        for pattern in STALE_PATTERNS:
+            for old_path in glob.glob(os.path.join(directory, pattern)):
+                name = os.path.relpath(old_path, directory).replace(os.sep, '/')
+                if name.rsplit('.json', 1)[0] + '.json' not in files:
+                    os.remove(old_path)
+
+        print(f"Updated {os.path.relpath(manifest_path, PROJECT_DIR)}: "
+              f"{new_files} new data files ({new_bytes / 1024:.0f} KB before compression)")
+
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Publish fighter data to public/ and dist/")
+    parser.add_argument('source', help="fighter records as a JSON array or NDJSON (one record per line)")
+    args = parser.parse_args()
+
+    # The pretty JSON and the bundles are only derived here, from whichever format holds the data
+    publish(load_fighters(args.source))
+
+
+if __name__ == "__main__":
+    main()
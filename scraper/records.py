@@ -0,0 +1,243 @@
+import math
+import sys
+from array import array
+
+from normalize import PERCENT_FIELDS, RATE_FIELDS, numeric_stats, parse_dob
+
+# Keys of a last_3_fights entry, in the order the published JSON uses
+FIGHT_FIELDS = ['result', 'opponent', 'method', 'round']
+
+# Columns of one bout (see Fight), in the fights store's column order. fighter1 is whoever's
+# page the bout was parsed from; winner is 1 or 2, or None for a draw / no contest (outcome)
+FIGHT_ROW_FIELDS = [
+    'fight_id', 'url', 'event', 'event_id', 'date', 'fighter1_id', 'fighter1', 'fighter2_id', 'fighter2',
+    'outcome', 'winner', 'method', 'method_detail', 'round', 'time',
+]
+SHARED_FIGHT_FIELDS = {'event', 'event_id', 'date', 'outcome', 'method', 'method_detail', 'round', 'time'}
+
+# One fighter's view of a bout (see Bout)
+BOUT_FIELDS = [
+    'fight_id', 'fighter_id', 'fighter', 'position', 'result', 'opponent', 'opponent_id',
+    'event', 'event_id', 'date', 'method', 'method_detail', 'round', 'time', 'url',
+]
+
+# Display fields of a fighter record, in the order the published JSON uses, with their defaults
+DISPLAY_DEFAULTS = {
+    'name': '',
+    'nickname': '',
+    'height': '--',
+    'weight': '--',
+    'reach': '--',
+    'stance': '',
+    'dob': '--',
+    'wins': 0,
+    'losses': 0,
+    'draws': 0,
+    'sig_strikes_landed_per_min': '0.00',
+    'striking_accuracy': '0%',
+    'sig_strikes_absorbed_per_min': '0.00',
+    'striking_defense': '0%',
+    'takedown_avg': '0.00',
+    'takedown_accuracy': '0%',
+    'takedown_defense': '0%',
+    'submission_avg': '0.0',
+}
+
+# Fields written only when they have a value
+OPTIONAL_FIELDS = ['age', 'ufcstats_id', 'scraped_at']
+
+# Default key order of a record: display fields, optional fields, history, then the typed stats
+FIGHTER_FIELDS = list(DISPLAY_DEFAULTS) + OPTIONAL_FIELDS + ['last_3_fights', 'stats']
+
+# The numeric part of the 'stats' record, held as one array of doubles (NaN = unknown)
+NUMERIC_FIELDS = ['height_in', 'weight_lbs', 'reach_in'] + RATE_FIELDS + PERCENT_FIELDS
+
+# Display values repeat across the roster ('--', '0%', "5' 11\"", 'Orthodox'), so one copy is shared
+SHARED_FIELDS = set(DISPLAY_DEFAULTS) - {'name', 'nickname', 'wins', 'losses', 'draws'}
+
+# Key orders seen in loaded records, shared between the records that use them
+_layouts = {}
+
+
+def _shared(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class FightResult:
+    """One bout on a fighter's record, as a last_3_fights entry"""
+
+    __slots__ = FIGHT_FIELDS
+
+    def __init__(self, result, opponent, method=None, round=None):
+        self.result = _shared(result)
+        self.opponent = opponent
+        self.method = _shared(method)
+        self.round = _shared(round)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(*(data.get(key) for key in FIGHT_FIELDS))
+
+    def to_dict(self):
+        """The entry as published: method and round only when known"""
+        data = {'result': self.result, 'opponent': self.opponent}
+        if self.method is not None:
+            data['method'] = self.method
+        if self.round is not None:
+            data['round'] = self.round
+        return data
+
+    def __eq__(self, other):
+        return isinstance(other, FightResult) and all(
+            getattr(self, key) == getattr(other, key) for key in FIGHT_FIELDS)
+
+    def __repr__(self):
+        return f"FightResult({self.result!r}, {self.opponent!r}, {self.method!r}, {self.round!r})"
+
+
+class Fight:
+    """One bout, stored once under its ufcstats fight-details id and linked to both fighters"""
+
+    __slots__ = FIGHT_ROW_FIELDS
+
+    def __init__(self, **fields):
+        for key in FIGHT_ROW_FIELDS:
+            value = fields.get(key)
+            setattr(self, key, _shared(value) if key in SHARED_FIGHT_FIELDS else value)
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(**{key: row[key] for key in FIGHT_ROW_FIELDS})
+
+    def to_row(self):
+        return tuple(getattr(self, key) for key in FIGHT_ROW_FIELDS)
+
+    def bout_for(self, fighter_id=None, position=None):
+        """The bout from one fighter's side; fighter1's when fighter_id is None or not in the fight"""
+        side = 2 if fighter_id is not None and fighter_id == self.fighter2_id else 1
+        if self.winner is None:
+            result = self.outcome
+        else:
+            result = 'win' if self.winner == side else 'loss'
+
+        return Bout(
+            fight_id=self.fight_id,
+            fighter_id=self.fighter2_id if side == 2 else self.fighter1_id,
+            fighter=self.fighter2 if side == 2 else self.fighter1,
+            position=position,
+            result=result,
+            opponent=self.fighter1 if side == 2 else self.fighter2,
+            opponent_id=self.fighter1_id if side == 2 else self.fighter2_id,
+            **{key: getattr(self, key) for key in BOUT_FIELDS if key in FIGHT_ROW_FIELDS and key != 'fight_id'},
+        )
+
+    def __repr__(self):
+        return f"Fight({self.fight_id!r}, {self.fighter1!r} vs {self.fighter2!r})"
+
+
+class Bout:
+    """One row of a fighter's fight history: a Fight seen from that fighter's side
+
+    position counts from 0 for the newest bout on the fighter's page.
+    """
+
+    __slots__ = BOUT_FIELDS
+
+    def __init__(self, **fields):
+        for key in BOUT_FIELDS:
+            setattr(self, key, fields.get(key))
+
+    def to_result(self):
+        """The bout as a last_3_fights entry"""
+        return FightResult(self.result, self.opponent, self.method, self.round)
+
+    def __repr__(self):
+        return f"Bout({self.fight_id!r}, {self.fighter!r} {self.result} vs {self.opponent!r})"
+
+
+class Fighter:
+    """One fighter record with its typed stats held in an array instead of a dict of floats
+
+    Display fields stay the strings the app shows; numbers is the parsed copy of them
+    (see normalize.numeric_stats) and has to be refreshed with parse_stats() after a
+    display field changes. Records loaded with from_dict keep their original key order,
+    so to_dict() reproduces the published JSON exactly.
+    """
+
+    __slots__ = list(DISPLAY_DEFAULTS) + OPTIONAL_FIELDS + ['last_3_fights', 'numbers', 'layout', 'extra']
+
+    def __init__(self, layout=None, **fields):
+        for key, default in DISPLAY_DEFAULTS.items():
+            value = fields.pop(key, default)
+            setattr(self, key, _shared(value) if key in SHARED_FIELDS else value)
+        for key in OPTIONAL_FIELDS:
+            setattr(self, key, fields.pop(key, None))
+        self.last_3_fights = fields.pop('last_3_fights', None) or []
+        self.layout = layout
+        self.extra = fields or None
+        self.parse_stats()
+
+    @classmethod
+    def from_dict(cls, data):
+        """Record from the published JSON; 'stats' is recomputed from the display fields"""
+        fields = {key: value for key, value in data.items() if key != 'stats'}
+        fights = fields.get('last_3_fights')
+        if fights:
+            fields['last_3_fights'] = [FightResult.from_dict(fight) for fight in fights]
+        layout = tuple(data)
+        fighter = cls(layout=_layouts.setdefault(layout, layout), **fields)
+        if layout == fighter.default_layout():
+            fighter.layout = None
+        return fighter
+
+    def parse_stats(self):
+        """Re-derive the numeric array from the display fields (only those the record carries)"""
+        present = self.layout or DISPLAY_DEFAULTS
+        stats = numeric_stats({key: getattr(self, key) for key in DISPLAY_DEFAULTS if key in present})
+        self.numbers = array('d', (math.nan if stats[key] is None else stats[key] for key in NUMERIC_FIELDS))
+
+    def stat(self, key):
+        """One typed stat, None when unknown"""
+        value = self.numbers[NUMERIC_FIELDS.index(key)]
+        return None if math.isnan(value) else value
+
+    @property
+    def stats(self):
+        """The typed 'stats' record, in the key order normalize.numeric_stats uses"""
+        values = [None if math.isnan(value) else value for value in self.numbers]
+        stats = dict(zip(NUMERIC_FIELDS[:3], values[:3]))
+        stats['dob'] = parse_dob(self.dob)
+        stats.update(zip(NUMERIC_FIELDS[3:], values[3:]))
+        return stats
+
+    def default_layout(self):
+        """Key order of a freshly scraped record: optional fields only when set"""
+        return tuple(key for key in FIGHTER_FIELDS
+                     if key not in OPTIONAL_FIELDS or getattr(self, key) is not None) + tuple(self.extra or ())
+
+    def to_dict(self):
+        """The record in the shape of public/fighters_data.json, with its typed 'stats'"""
+        data = {}
+        for key in self.layout or self.default_layout():
+            if key == 'stats':
+                data[key] = self.stats
+            elif key == 'last_3_fights':
+                data[key] = [fight.to_dict() for fight in self.last_3_fights]
+            elif self.extra and key in self.extra:
+                data[key] = self.extra[key]
+            else:
+                data[key] = getattr(self, key)
+        return data
+
+    def __repr__(self):
+        return f"Fighter({self.name!r}, {self.wins}-{self.losses}-{self.draws})"
+
+
+def load_records(fighters):
+    """Fighter records for a list of published dicts"""
+    return [Fighter.from_dict(fighter) for fighter in fighters]
+
+
+def dump_records(records):
+    """Published dicts for a list of Fighter records"""
+    return [record.to_dict() for record in records]
@@ -1,12 +1,8 @@
-import requests
-from bs4 import BeautifulSoup
+from fetcher import get_fetcher
 
 # Test with a known fighter - Hamdy Abdelwahab
 fighter_url = "http://ufcstats.com/fighter-details/19bc93c5ab46cbbe"
-headers = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'}
-
-response = requests.get(fighter_url, headers=headers)
-soup = BeautifulSoup(response.content, 'html.parser')
+soup = get_fetcher().get_soup(fighter_url)
 
 # Find all tables
 all_tables = soup.find_all('table')
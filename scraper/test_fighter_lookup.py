@@ -1,12 +1,8 @@
-import requests
-from bs4 import BeautifulSoup
+from fetcher import get_fetcher
 
 def test_fighter_lookup(fighter_name):
     """Test looking up a fighter"""
     base_url = "http://ufcstats.com/statistics/fighters"
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-    }
     
     # Get first letter of last name
     name_parts = fighter_name.strip().split()
@@ -21,8 +17,7 @@ def test_fighter_lookup(fighter_name):
     url = f"{base_url}?char={first_letter}&page=all"
     print(f"URL: {url}\n")
     
-    response = requests.get(url, headers=headers)
-    soup = BeautifulSoup(response.content, 'html.parser')
+    soup = get_fetcher().get_soup(url)
     
     table = soup.find('table', class_='b-statistics__table')
     if table:
@@ -1,21 +1,29 @@
-import requests
-from bs4 import BeautifulSoup
-import json
-import time
-import re
+import argparse
+import functools
+from collections import Counter
+
+from delta_refresh import match_existing, plan_refresh
+from extractor import extract_fighter
+from fetcher import get_fetcher
+from fighter_index import FighterIndex, normalize_name
+from journal import open_journal
+from publish import load_fighters, publish
+from parsing import LISTING_PAGE, make_soup
 
 class UFCScraper:
-    def __init__(self):
+    def __init__(self, fetcher=None, fast_parse=True):
         self.base_url = "http://ufcstats.com/statistics/fighters"
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        }
+        self.fetcher = fetcher or get_fetcher()
+        self.fast_parse = fast_parse
     
     def scrape_fighters_list(self, letter='a'):
         """Scrape list of fighters starting with a specific letter"""
         url = f"{self.base_url}?char={letter}&page=all"
-        response = requests.get(url, headers=self.headers)
-        soup = BeautifulSoup(response.content, 'html.parser')
+        return self.parse_fighters_list(self.fetcher.get(url).content)
+    
+    def parse_fighters_list(self, html):
+        """Parse the fighters table out of a listing page"""
+        soup = make_soup(html, LISTING_PAGE, fast=self.fast_parse)
         
         fighters = []
         table = soup.find('table', class_='b-statistics__table')
@@ -37,177 +45,138 @@ class UFCScraper:
         
         return fighters
     
-    def scrape_fighter_details(self, fighter_url):
+    def scrape_fighter_details(self, fighter_url, max_age=None):
         """Scrape detailed stats for a specific fighter"""
-        response = requests.get(fighter_url, headers=self.headers)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        stats = {}
-        
-        # Basic info
-        name_tag = soup.find('span', class_='b-content__title-highlight')
-        if name_tag:
-            stats['name'] = name_tag.text.strip()
-        
-        nickname_tag = soup.find('p', class_='b-content__Nickname')
-        if nickname_tag:
-            stats['nickname'] = nickname_tag.text.strip().replace('Nickname:', '').strip()
-        
-        # Fighter details
-        details_list = soup.find_all('li', class_='b-list__box-list-item')
-        for item in details_list:
-            label = item.text.strip()
-            
-            if 'Height:' in label:
-                stats['height'] = label.split('Height:')[1].strip()
-            elif 'Weight:' in label:
-                stats['weight'] = label.split('Weight:')[1].strip()
-            elif 'Reach:' in label:
-                stats['reach'] = label.split('Reach:')[1].strip()
-            elif 'STANCE:' in label:
-                stats['stance'] = label.split('STANCE:')[1].strip()
-            elif 'DOB:' in label:
-                stats['dob'] = label.split('DOB:')[1].strip()
-        
-        # Record
-        record_tag = soup.find('span', class_='b-content__title-record')
-        if record_tag:
-            record_text = record_tag.text.strip()
-            record_match = re.search(r'Record:\s*(\d+)-(\d+)-(\d+)', record_text)
-            if record_match:
-                stats['wins'] = int(record_match.group(1))
-                stats['losses'] = int(record_match.group(2))
-                stats['draws'] = int(record_match.group(3))
-        
-        # Career stats
-        career_stats = soup.find_all('div', class_='b-list__info-box-left')
-        for stat_box in career_stats:
-            items = stat_box.find_all('li', class_='b-list__box-list-item')
-            for item in items:
-                text = item.text.strip()
-                
-                if 'SLpM:' in text:
-                    stats['sig_strikes_landed_per_min'] = text.split('SLpM:')[1].strip()
-                elif 'Str. Acc.:' in text:
-                    stats['striking_accuracy'] = text.split('Str. Acc.:')[1].strip()
-                elif 'SApM:' in text:
-                    stats['sig_strikes_absorbed_per_min'] = text.split('SApM:')[1].strip()
-                elif 'Str. Def:' in text:
-                    stats['striking_defense'] = text.split('Str. Def:')[1].strip()
-                elif 'TD Avg.:' in text:
-                    stats['takedown_avg'] = text.split('TD Avg.:')[1].strip()
-                elif 'TD Acc.:' in text:
-                    stats['takedown_accuracy'] = text.split('TD Acc.:')[1].strip()
-                elif 'TD Def.:' in text:
-                    stats['takedown_defense'] = text.split('TD Def.:')[1].strip()
-                elif 'Sub. Avg.:' in text:
-                    stats['submission_avg'] = text.split('Sub. Avg.:')[1].strip()
-        
-        return stats
+        return self.parse_fighter_details(self.fetcher.get(fighter_url, max_age).content, fighter_url)
     
-    def scrape_fight_history(self, soup):
-        """Extract last 3 fights from fighter page"""
-        fights = []
-        
-        try:
-            # Find the fight history table
-            fight_table = soup.find('table', class_='b-fight-details__table')
-            
-            if fight_table:
-                rows = fight_table.find_all('tr', class_='b-fight-details__table-row')[1:]  # Skip header
-                
-                # Get last 3 fights (or fewer if they don't have 3)
-                for row in rows[:3]:
-                    cols = row.find_all('td')
-                    
-                    if len(cols) >= 2:
-                        fight_data = {}
-                        
-                        # Result (W/L/D/NC)
-                        result_col = cols[0]
-                        result_text = result_col.text.strip()
-                        if result_text:
-                            fight_data['result'] = result_text
-                        
-                        # Opponent name
-                        opponent_col = cols[1]
-                        opponent_link = opponent_col.find('a')
-                        if opponent_link:
-                            fight_data['opponent'] = opponent_link.text.strip()
-                        
-                        # Method (KO/TKO, SUB, DEC, etc)
-                        if len(cols) >= 7:
-                            method_col = cols[6]
-                            method_text = method_col.text.strip()
-                            # Parse method and round
-                            method_parts = method_text.split()
-                            if method_parts:
-                                fight_data['method'] = method_parts[0]
-                            
-                            # Round
-                            if len(cols) >= 8:
-                                round_col = cols[7]
-                                round_text = round_col.text.strip()
-                                if round_text:
-                                    fight_data['round'] = round_text
-                        
-                        if fight_data:
-                            fights.append(fight_data)
-        
-        except Exception as e:
-            print(f"Error scraping fight history: {e}")
-        
-        return fights
+    def parse_fighter_details(self, html, fighter_url=None):
+        """Parse detailed stats out of a fighter page"""
+        return extract_fighter(html, fast=self.fast_parse, url=fighter_url).to_dict()
     
-    def scrape_all_fighters(self, limit=None):
-        """Scrape all fighters from A-Z"""
+    def scrape_all_fighters(self, limit=None, journal=None):
+        """Scrape all fighters from A-Z, skipping and journaling finished ones if a journal is given"""
         all_fighters = []
         letters = 'abcdefghijklmnopqrstuvwxyz'
         
         print("Scraping fighters list...")
+        by_letter = {}
+        for letter, fighters, error in self.fetcher.map(self.scrape_fighters_list, letters):
+            if error:
+                print(f"Error fetching fighters starting with '{letter.upper()}': {error}")
+                continue
+            print(f"Fetched {len(fighters)} fighters starting with '{letter.upper()}'")
+            by_letter[letter] = fighters
+
+        # Listing pages finish out of order, so reassemble them A-Z
         for letter in letters:
-            print(f"Fetching fighters starting with '{letter.upper()}'...")
-            fighters = self.scrape_fighters_list(letter)
-            all_fighters.extend(fighters)
-            time.sleep(1)  # Be respectful to the server
-        
+            all_fighters.extend(by_letter.get(letter, []))
+
         print(f"\nFound {len(all_fighters)} fighters total.")
-        
+
         if limit:
             all_fighters = all_fighters[:limit]
             print(f"Limiting to {limit} fighters for testing.")
-        
-        # Now get detailed stats for each fighter
-        detailed_fighters = []
-        for i, fighter in enumerate(all_fighters, 1):
-            print(f"Scraping details for {fighter['name']} ({i}/{len(all_fighters)})...")
-            try:
-                details = self.scrape_fighter_details(fighter['url'])
-                detailed_fighters.append(details)
-                time.sleep(1)  # Be respectful to the server
-            except Exception as e:
-                print(f"Error scraping {fighter['name']}: {e}")
+
+        details_by_url = self.scrape_details(all_fighters, journal)
+        return [details_by_url[f['url']] for f in all_fighters if f['url'] in details_by_url]
+
+    def scrape_details(self, fighters, journal=None, max_age=None):
+        """Fetch detail pages for listing entries, several at a time under the fetcher's rate cap
+
+        With a journal, fighters it already holds are not fetched again and each new
+        result is appended to it as it arrives; the returned details come from the journal.
+        max_age is passed on to Fetcher.get (0 revalidates every cached page).
+        """
+        details_by_url = {}
+        names = {fighter['url']: fighter['name'] for fighter in fighters}
+        urls = list(names)
+
+        if journal is not None:
+            details_by_url = {url: journal.done[url] for url in urls if url in journal}
+            urls = journal.pending(urls)
+            if details_by_url:
+                print(f"Skipping {len(details_by_url)} fighters already in the journal")
+
+        for i, (url, details, error) in enumerate(self.fetcher.map(functools.partial(self.scrape_fighter_details, max_age=max_age), urls), 1):
+            if error:
+                print(f"Error scraping {names[url]}: {error}")
                 continue
-        
-        return detailed_fighters
+            print(f"Scraped details for {names[url]} ({i}/{len(urls)})")
+            if journal is not None:
+                journal.record(url, details)
+            details_by_url[url] = details
+
+        return details_by_url
+
+    def refresh_fighters(self, existing, max_age_days=30, limit=None, journal=None):
+        """Incremental scrape: only fetch detail pages for new fighters, changed records and stale data
+
+        The listing pages already show every fighter's W/L/D, so a fighter whose record
+        matches what we stored and who was scraped within max_age_days is kept as-is.
+        """
+        print("Scraping fighters list...")
+        index = FighterIndex.build(self.fetcher, listing_url=f"{self.base_url}?char={{letter}}&page=all")
+        listing = index.fighters[:limit] if limit else index.fighters
+
+        to_fetch, _ = plan_refresh(listing, existing, max_age_days)
+        reasons = Counter(reason for _, reason in to_fetch)
+        summary = ', '.join(f"{count} {reason}" for reason, count in reasons.items()) or 'nothing to do'
+        print(f"\n{len(to_fetch)} of {len(listing)} fighters need their detail page ({summary})")
+
+        # These pages were picked because they changed or went stale, so the cache can't answer for them
+        details_by_url = self.scrape_details([entry for entry, _ in to_fetch], journal, max_age=0)
+
+        # Listing order, refreshed records where we have them, stored ones otherwise
+        by_id, by_name = match_existing(existing)
+        matched = set()
+        fighters = []
+        for entry in listing:
+            stored = by_id.get(entry['id']) or by_name.get(normalize_name(entry['name']))
+            if stored is not None:
+                matched.add(id(stored))
+            record = details_by_url.get(entry['url'], stored)
+            if record is not None:
+                fighters.append(record)
+
+        # Keep stored fighters the listing didn't cover (manual entries, past the limit)
+        fighters.extend(record for record in existing if id(record) not in matched)
+        return fighters
     
     def save_to_json(self, fighters, filename='fighters_data.json'):
-        """Save fighter data to JSON file"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(fighters, indent=2, fp=f, ensure_ascii=False)
-        print(f"\nData saved to {filename}")
+        """Atomically save fighter data to a single JSON file"""
+        publish(fighters, [filename])
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Scrape UFC fighter stats from ufcstats.com")
+    parser.add_argument('--full', action='store_true',
+                        help="fetch every fighter's detail page instead of only new, changed or stale ones")
+    parser.add_argument('--max-age-days', type=int, default=30,
+                        help="refetch fighters whose stored data is older than this (default: 30)")
+    parser.add_argument('--limit', type=int, default=500,
+                        help="only process the first N listed fighters (default: 500, 0 for all)")
+    parser.add_argument('--restart', action='store_true',
+                        help="ignore the progress journal of an interrupted run and start over")
+    args = parser.parse_args()
+    
     scraper = UFCScraper()
     
-    # Scrape all fighters (this will take 30-60 minutes due to rate limiting)
-    # Pass limit=500 for faster testing (about 10 minutes)
-    fighters = scraper.scrape_all_fighters(limit=500)
+    existing = load_fighters()
+    
+    # Detail pages are fetched in parallel, so run time is set by the fetcher's
+    # requests-per-second cap rather than latency. With existing data only fighters
+    # whose listing record changed, new fighters and stale entries are refetched.
+    # Finished fighters are journaled as they come in, so an interrupted run picks up where it stopped
+    journal = open_journal('ufc_scraper', restart=args.restart)
+    if args.full or not existing:
+        fighters = scraper.scrape_all_fighters(limit=args.limit or None, journal=journal)
+    else:
+        fighters = scraper.refresh_fighters(existing, max_age_days=args.max_age_days,
+                                            limit=args.limit or None, journal=journal)
     
-    # Save to public directory so it's accessible by the React app
-    output_path = '../public/fighters_data.json'
-    scraper.save_to_json(fighters, output_path)
+    # Publish to public/ (and dist/ if built) so it's accessible by the React app
+    publish(fighters)
+    journal.discard()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,83 @@
+import argparse
+import json
+import os
+from datetime import date
+
+from events import UPCOMING_URL, parse_card, parse_events_listing
+from extractor import utc_now
+from fetcher import get_fetcher
+from fight_store import FIGHTS_DB_PATH, FightStore, refresh_fighters
+from publish import BUNDLE_DIRS, PROJECT_DIR, write_atomic
+
+CARD_NAME = 'card.json'
+
+
+def next_event(listing, today=None, event_id=None):
+    """The listed event with event_id, or the soonest one not already held, or None"""
+    if event_id:
+        return next((event for event in listing if event['id'] == event_id), None)
+
+    today = (today or date.today()).isoformat()
+    upcoming = [event for event in listing if event['date'] and event['date'] >= today]
+    return min(upcoming, key=lambda event: event['date'], default=None)
+
+
+def card_fighters(bouts):
+    """{id: name} of everyone booked on the card"""
+    fighters = {}
+    for bout in bouts:
+        for side in ('fighter1', 'fighter2'):
+            fighters[bout[side]['id']] = bout[side]['name']
+    return fighters
+
+
+def write_card(card, directories=None):
+    """Write card.json next to the data manifest in public/ and dist/; returns the paths written"""
+    data = json.dumps(card, indent=2, ensure_ascii=False).encode('utf-8')
+    written = []
+    for directory in directories or BUNDLE_DIRS:
+        if not os.path.isdir(os.path.dirname(directory)):
+            continue
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, CARD_NAME)
+        write_atomic(path, data)
+        written.append(path)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh the fighters booked on the next UFC event and write its card")
+    parser.add_argument('--event', help="ufcstats event id to use instead of the next one listed")
+    parser.add_argument('--db', default=FIGHTS_DB_PATH)
+    parser.add_argument('--no-refresh', action='store_true', help="only write the card, don't refetch fighter pages")
+    args = parser.parse_args()
+
+    fetcher = get_fetcher()
+    # The card changes all fight week, so the listing and event page are always revalidated
+    listing = parse_events_listing(fetcher.get(UPCOMING_URL, max_age=0).content)
+    event = next_event(listing, event_id=args.event)
+    if event is None:
+        print("❌ No upcoming event found" + (f" with id {args.event}" if args.event else ""))
+        return
+
+    bouts = parse_card(fetcher.get(event['url'], max_age=0).content)
+    print(f"📅 {event['date']} {event['name']}: {len(bouts)} bouts")
+    for bout in bouts:
+        tags = ' (title)' if bout['title'] else ' (main event)' if bout['main_event'] else ''
+        print(f"   {bout['fighter1']['name']} vs {bout['fighter2']['name']} - "
+              f"{bout['weight_class']}, {bout['scheduled_rounds']} rounds{tags}")
+
+    fighters = card_fighters(bouts)
+    if not args.no_refresh and fighters:
+        print(f"\n🔄 Refreshing {len(fighters)} fighters...")
+        with FightStore(args.db) as store:
+            refreshed = refresh_fighters(store, fighters, max_age=0)
+        print(f"Refreshed {len(refreshed)} of {len(fighters)} fighters")
+
+    card = {'generated_at': utc_now(), 'event': event, 'bouts': bouts}
+    for path in write_card(card):
+        print(f"Wrote {os.path.relpath(path, PROJECT_DIR)}")
+
+
+if __name__ == "__main__":
+    main()
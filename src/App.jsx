@@ -1,8 +1,9 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import FighterSelector from './components/FighterSelector';
 import FightPrediction from './components/FightPrediction';
 import FightCard from './components/FightCard';
 import { predictFight, simulateRounds } from './utils/fightPredictor';
+import { loadFighterIndex, loadFighter } from './utils/fighterData';
 import './App.css';
 
 function App() {
@@ -15,15 +16,14 @@ function App() {
   const [fightCard, setFightCard] = useState([]);
   const [viewMode, setViewMode] = useState('single'); // 'single' or 'card'
   const [numRounds, setNumRounds] = useState(5);
+  // Latest pick per selector, so a slow shard load can't overwrite a later pick
+  const latestSelection = useRef({});
 
   useEffect(() => {
     console.log('Starting to load fighters data...');
-    // Load fighters data
-    fetch('/fighters_data_new.json')
-      .then(res => {
-        console.log('Fetch response:', res.status, res.statusText);
-        return res.json();
-      })
+    // Only the compact name index is loaded up front; full records come per shard
+    // when a fighter is picked (see utils/fighterData.js)
+    loadFighterIndex()
       .then(data => {
         console.log('Loaded fighters:', data.length, 'fighters');
         console.log('First few fighters:', data.slice(0, 3));
@@ -36,6 +36,18 @@ function App() {
       });
   }, []);
 
+  // Selector entries may be index rows, so fetch the full record before using it
+  const selectFighter = (slot, setFighter) => (entry) => {
+    latestSelection.current[slot] = entry;
+    loadFighter(entry)
+      .then(fighter => {
+        if (latestSelection.current[slot] === entry) {
+          setFighter(fighter || null);
+        }
+      })
+      .catch(err => console.error('Error loading fighter:', err));
+  };
+
   const handlePredict = () => {
     if (fighter1 && fighter2) {
       const result = predictFight(fighter1, fighter2, numRounds);
@@ -48,6 +60,7 @@ function App() {
   };
 
   const handleReset = () => {
+    latestSelection.current = {};
     setFighter1(null);
     setFighter2(null);
     setPrediction(null);
@@ -126,7 +139,7 @@ function App() {
           <FighterSelector
             fighters={fighters}
             selectedFighter={fighter1}
-            onSelect={setFighter1}
+            onSelect={selectFighter('fighter1', setFighter1)}
             label="Red Corner"
             disabled={!!prediction}
           />
@@ -138,7 +151,7 @@ function App() {
           <FighterSelector
             fighters={fighters}
             selectedFighter={fighter2}
-            onSelect={setFighter2}
+            onSelect={selectFighter('fighter2', setFighter2)}
             label="Blue Corner"
             disabled={!!prediction}
           />
@@ -17,6 +17,27 @@ const parseNumber = (str) => {
   return isNaN(num) ? 0 : num;
 };
 
+// Helper function to parse height strings like 5' 11" into inches
+const parseHeight = (str) => {
+  const match = /(\d+)'\s*(\d+)?/.exec(str || '');
+  return match ? parseInt(match[1]) * 12 + parseInt(match[2] || 0) : parseNumber(str);
+};
+
+// Typed value of a stat. Published data carries a `stats` record the scraper already
+// normalized (inches, pounds, floats, null for "--"); older records only have the
+// display strings, so those are parsed as a fallback
+const statValue = (fighter, key, parse = parseNumber, display = key) => {
+  if (fighter.stats && key in fighter.stats) return fighter.stats[key] ?? 0;
+  return parse(fighter[display]);
+};
+
+// Date of birth from the stats record when present (ISO, read as local midnight),
+// display string otherwise
+const dobOf = (fighter) => {
+  if (!fighter.stats) return fighter.dob;
+  return fighter.stats.dob ? `${fighter.stats.dob}T00:00:00` : null;
+};
+
 // Helper function to calculate age from date of birth
 const calculateAge = (dob) => {
   if (!dob) return null;
@@ -32,7 +53,7 @@ const calculateAge = (dob) => {
 
 // Calculate age/prime factor
 const calculateAgeFactor = (fighter) => {
-  const age = calculateAge(fighter.dob);
+  const age = calculateAge(dobOf(fighter));
   if (!age) return 1.0; // Neutral if age unknown
   
   // Prime years: 28-32 get a boost
@@ -60,9 +81,9 @@ const calculateFinishRate = (fighter) => {
   
   // Estimate finishes based on submission and striking capabilities
   // This is an approximation - ideally we'd have actual finish data
-  const subAvg = parseNumber(fighter.submission_avg);
-  const slpm = parseNumber(fighter.sig_strikes_landed_per_min);
-  const strikeAcc = parsePercentage(fighter.striking_accuracy);
+  const subAvg = statValue(fighter, 'submission_avg');
+  const slpm = statValue(fighter, 'sig_strikes_landed_per_min');
+  const strikeAcc = statValue(fighter, 'striking_accuracy', parsePercentage);
   
   // Higher values indicate more finishing ability
   const finishPotential = (subAvg * 10) + (slpm * strikeAcc / 100);
@@ -71,8 +92,7 @@ const calculateFinishRate = (fighter) => {
 
 // Detect weight class
 const detectWeightClass = (fighter) => {
-  const weightStr = fighter.weight || '';
-  const weight = parseNumber(weightStr);
+  const weight = statValue(fighter, 'weight_lbs', parseNumber, 'weight');
   
   if (weight <= 125) return 'Flyweight';
   if (weight <= 135) return 'Bantamweight';
@@ -171,10 +191,10 @@ const getFightLengthAdjustment = (fighter, numRounds) => {
 
 // Calculate striking score
 const calculateStrikingScore = (fighter) => {
-  const slpm = parseNumber(fighter.sig_strikes_landed_per_min);
-  const strikeAcc = parsePercentage(fighter.striking_accuracy);
-  const sapm = parseNumber(fighter.sig_strikes_absorbed_per_min);
-  const strikeDef = parsePercentage(fighter.striking_defense);
+  const slpm = statValue(fighter, 'sig_strikes_landed_per_min');
+  const strikeAcc = statValue(fighter, 'striking_accuracy', parsePercentage);
+  const sapm = statValue(fighter, 'sig_strikes_absorbed_per_min');
+  const strikeDef = statValue(fighter, 'striking_defense', parsePercentage);
   
   // Higher is better for slpm, strikeAcc, strikeDef
   // Lower is better for sapm (absorbed)
@@ -186,10 +206,10 @@ const calculateStrikingScore = (fighter) => {
 
 // Calculate grappling score
 const calculateGrapplingScore = (fighter) => {
-  const tdAvg = parseNumber(fighter.takedown_avg);
-  const tdAcc = parsePercentage(fighter.takedown_accuracy);
-  const tdDef = parsePercentage(fighter.takedown_defense);
-  const subAvg = parseNumber(fighter.submission_avg);
+  const tdAvg = statValue(fighter, 'takedown_avg');
+  const tdAcc = statValue(fighter, 'takedown_accuracy', parsePercentage);
+  const tdDef = statValue(fighter, 'takedown_defense', parsePercentage);
+  const subAvg = statValue(fighter, 'submission_avg');
   
   const offensiveGrappling = (tdAvg * 20) + (tdAcc * 0.3) + (subAvg * 30);
   const defensiveGrappling = tdDef * 0.5;
@@ -217,16 +237,17 @@ const calculatePhysicalAdvantage = (fighter1, fighter2) => {
   let advantage = 0;
   
   // Reach advantage
-  const reach1 = parseNumber(fighter1.reach);
-  const reach2 = parseNumber(fighter2.reach);
+  const reach1 = statValue(fighter1, 'reach_in', parseNumber, 'reach');
+  const reach2 = statValue(fighter2, 'reach_in', parseNumber, 'reach');
   if (reach1 && reach2) {
     const reachDiff = reach1 - reach2;
     advantage += reachDiff * 0.5; // Each inch of reach = 0.5 points
   }
   
-  // Height advantage
-  const height1 = parseNumber(fighter1.height);
-  const height2 = parseNumber(fighter2.height);
+  // Height advantage. The weight below was tuned on whole feet (parseNumber of 5' 11"
+  // reads 5), so inches are brought back to that scale; retuning belongs in its own change
+  const height1 = Math.floor(statValue(fighter1, 'height_in', parseHeight, 'height') / 12);
+  const height2 = Math.floor(statValue(fighter2, 'height_in', parseHeight, 'height') / 12);
   if (height1 && height2) {
     const heightDiff = height1 - height2;
     advantage += heightDiff * 0.3; // Each inch of height = 0.3 points
@@ -317,7 +338,7 @@ export const predictFight = (fighter1, fighter2, numRounds = 5) => {
   const determineLikelyFinish = (fighter) => {
     const striking = calculateStrikingScore(fighter);
     const grappling = calculateGrapplingScore(fighter);
-    const subAvg = parseNumber(fighter.submission_avg);
+    const subAvg = statValue(fighter, 'submission_avg');
     
     if (grappling > striking * 1.3 && subAvg > 0.5) {
       return 'Submission';
@@ -412,7 +433,7 @@ export const predictFight = (fighter1, fighter2, numRounds = 5) => {
       recordScore: fighter1Record.toFixed(1),
       physicalScore: fighter1Physical.toFixed(1),
       totalScore: fighter1Total.toFixed(1),
-      age: calculateAge(fighter1.dob),
+      age: calculateAge(dobOf(fighter1)),
       ageFactor: fighter1AgeFactor,
       finishRate: fighter1FinishRate.toFixed(1),
       style: fighter1Style
@@ -426,7 +447,7 @@ export const predictFight = (fighter1, fighter2, numRounds = 5) => {
       recordScore: fighter2Record.toFixed(1),
       physicalScore: fighter2Physical.toFixed(1),
       totalScore: fighter2Total.toFixed(1),
-      age: calculateAge(fighter2.dob),
+      age: calculateAge(dobOf(fighter2)),
       ageFactor: fighter2AgeFactor,
       finishRate: fighter2FinishRate.toFixed(1),
       style: fighter2Style
@@ -464,8 +485,8 @@ export const simulateRounds = (fighter1, fighter2, numRounds = 5) => {
   let fighter2Damage = 0;
   
   for (let i = 1; i <= numRounds; i++) {
-    const f1StrikingRate = parseNumber(fighter1.sig_strikes_landed_per_min);
-    const f2StrikingRate = parseNumber(fighter2.sig_strikes_landed_per_min);
+    const f1StrikingRate = statValue(fighter1, 'sig_strikes_landed_per_min');
+    const f2StrikingRate = statValue(fighter2, 'sig_strikes_landed_per_min');
     
     // Simulate strikes landed (with some randomness)
     const f1Strikes = Math.floor(f1StrikingRate * 5 * (0.8 + Math.random() * 0.4));
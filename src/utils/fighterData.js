@@ -0,0 +1,66 @@
+/**
+ * Fighter data loading
+ * Reads the data manifest written by the scraper's publisher, loads the compact
+ * fighter index up front and fetches full records one shard at a time on demand
+ */
+
+const MANIFEST_URL = '/data/manifest.json';
+const FALLBACK_URL = '/fighters_data_new.json';
+
+// Shard URL -> promise of { id: full record }, so each shard is fetched at most once
+const shardCache = new Map();
+
+const fetchJson = async (url, options) => {
+  const response = await fetch(url, options);
+  if (!response.ok) {
+    throw new Error(`${url}: ${response.status}`);
+  }
+  return response.json();
+};
+
+/**
+ * Load the list the fighter selector shows.
+ * With a manifest these are index rows ({ id, name, nickname, weight, wins, losses, draws, shard });
+ * without one it falls back to the full fighter records.
+ */
+export const loadFighterIndex = async () => {
+  let manifest;
+  try {
+    // The manifest is tiny and changes on every publish; the files it names never do
+    manifest = await fetchJson(MANIFEST_URL, { cache: 'no-cache' });
+  } catch (err) {
+    console.warn('No data manifest, loading full fighter data:', err);
+    return fetchJson(FALLBACK_URL);
+  }
+
+  if (!manifest.index) {
+    return fetchJson(manifest.fighters.file);
+  }
+
+  const { fields, rows } = await fetchJson(manifest.index.file);
+  return rows.map(row => {
+    const entry = Object.fromEntries(fields.map((field, i) => [field, row[i]]));
+    entry.shardUrl = manifest.shards[entry.shard];
+    return entry;
+  });
+};
+
+/**
+ * Full record (stats, fight history) for an entry returned by loadFighterIndex
+ */
+export const loadFighter = async (entry) => {
+  if (!entry.shardUrl) {
+    return entry; // Already a full record
+  }
+
+  if (!shardCache.has(entry.shardUrl)) {
+    const request = fetchJson(entry.shardUrl).catch(err => {
+      shardCache.delete(entry.shardUrl);
+      throw err;
+    });
+    shardCache.set(entry.shardUrl, request);
+  }
+
+  const shard = await shardCache.get(entry.shardUrl);
+  return shard[entry.id];
+};